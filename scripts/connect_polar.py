@@ -1,6 +1,11 @@
+import argparse
 import asyncio
+import contextlib
+import signal
 import sys
+from collections import deque
 from pathlib import Path
+from typing import Any
 
 # Dynamically add the 'src' directory to sys.path so 'polar_ble_sdk' is importable
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
@@ -8,6 +13,7 @@ sys.path.append(str(PROJECT_ROOT / "src"))
 
 try:
     from polar_ble_sdk.connector.ble_discovery import discover_polar_device
+    from polar_ble_sdk.connector.event_loop import use_uvloop
     from polar_ble_sdk.connector.stream import create_polar_connector
 except ImportError as e:
     print(
@@ -16,37 +22,127 @@ except ImportError as e:
     sys.exit(1)
 
 
+# Callbacks only stage (kind, payload) tuples; _print_loop formats and writes
+# them in batches so the BLE notification path never touches stdout.
+MAX_PENDING = 4096
+PRINT_INTERVAL = 0.1  # seconds
+# Without --verbose, a single status line is rewritten in place this often.
+STATUS_INTERVAL = 1.0  # seconds
+
+pending: deque[tuple[str, Any]] = deque()
+dropped = 0
+# Raw-sample previews of the high-rate streams are only staged with --verbose;
+# otherwise those callbacks just count packets.
+verbose = False
+packet_counts = {"ppg": 0, "acc": 0, "ecg": 0}
+latest: dict[str, Any] = {"hr": None, "ppi": None}
+
+
+def _stage(kind: str, payload: Any) -> None:
+    global dropped
+    if len(pending) >= MAX_PENDING:
+        dropped += 1
+        return
+    pending.append((kind, payload))
+
+
+def _format_hr(data) -> str:
+    hr_val, rr_ints = data
+    rr_str = f", RR-intervals: {rr_ints}" if rr_ints else ""
+    return f"\r[HR] Heart Rate: {hr_val} BPM{rr_str}"
+
+
+_FORMATTERS = {
+    "hr": _format_hr,
+    "ppi": lambda ppi_vals: f"\n[PPI] Pulse-to-Pulse Intervals: {ppi_vals} ms\n",
+    # preview of the first few samples only
+    "ppg": lambda samples: f"\n[PPG] Optical Pulse samples: {samples[:3]}...\n",
+    "acc": lambda samples: f"\n[ACC] Accelerometer: {samples[:2]}...\n",
+    "ecg": lambda samples: f"\n[ECG] ECG samples: {samples[:3]}...\n",
+}
+
+
+def _drain_pending() -> None:
+    if not pending:
+        return
+    parts = []
+    while pending:
+        kind, payload = pending.popleft()
+        parts.append(_FORMATTERS[kind](payload))
+    sys.stdout.write("".join(parts))
+    sys.stdout.flush()
+
+
+def _write_status() -> None:
+    parts = []
+    if latest["hr"] is not None:
+        hr_val, rr_ints = latest["hr"]
+        parts.append(f"HR {hr_val} BPM" + (f" RR {rr_ints}" if rr_ints else ""))
+    if latest["ppi"] is not None:
+        parts.append(f"PPI {latest['ppi']} ms")
+    parts.extend(f"{k.upper()} {n} pkts" for k, n in packet_counts.items() if n)
+    if parts:
+        # Trailing spaces clear leftovers from a longer previous line.
+        sys.stdout.write("\r" + " | ".join(parts) + " " * 8)
+        sys.stdout.flush()
+
+
+async def _print_loop() -> None:
+    while True:
+        if verbose:
+            await asyncio.sleep(PRINT_INTERVAL)
+            _drain_pending()
+        else:
+            await asyncio.sleep(STATUS_INTERVAL)
+            _write_status()
+
+
 def hr_callback(data):
     if isinstance(data, tuple) and len(data) >= 2:
-        hr_val, rr_ints = data
-        rr_str = f", RR-intervals: {rr_ints}" if rr_ints else ""
-        print(f"\r[HR] Heart Rate: {hr_val} BPM{rr_str}", end="", flush=True)
+        if verbose:
+            _stage("hr", data[:2])
+        else:
+            latest["hr"] = data[:2]
 
 
 def ppi_callback(data):
     # data is (timestamp, ppi_values)
-    timestamp, ppi_vals = data
-    print(f"\n[PPI] Pulse-to-Pulse Intervals: {ppi_vals} ms")
+    if verbose:
+        _stage("ppi", data[1])
+    else:
+        latest["ppi"] = data[1]
 
 
 def ppg_callback(data):
     # data is (timestamp, sample_values)
-    timestamp, samples = data
-    # print a preview of PPG values
-    print(f"\n[PPG] Optical Pulse samples: {samples[:3]}...")
+    packet_counts["ppg"] += 1
+    if verbose:
+        _stage("ppg", data[1])
 
 
 def acc_callback(data):
-    timestamp, samples = data
-    print(f"\n[ACC] Accelerometer: {samples[:2]}...")
+    packet_counts["acc"] += 1
+    if verbose:
+        _stage("acc", data[1])
 
 
 def ecg_callback(data):
-    timestamp, samples = data
-    print(f"\n[ECG] ECG samples: {samples[:3]}...")
+    packet_counts["ecg"] += 1
+    if verbose:
+        _stage("ecg", data[1])
 
 
 async def main():
+    global verbose
+    parser = argparse.ArgumentParser(description="Stream live data from a Polar device")
+    parser.add_argument(
+        "-v",
+        "--verbose",
+        action="store_true",
+        help="Print every HR/PPI update and a preview of every PPG/ACC/ECG packet",
+    )
+    verbose = parser.parse_args().verbose
+
     print("Scanning for Polar devices...")
     device = await discover_polar_device(timeout=20.0)
 
@@ -71,25 +167,47 @@ async def main():
         ecg_callback=ecg_callback,
     )
 
+    stop_event = asyncio.Event()
+    loop = asyncio.get_running_loop()
+
+    print_task = asyncio.create_task(_print_loop())
     try:
         await connector.start_notify()
+        # Once streaming, Ctrl+C sets the event instead of the loop polling
+        # once per second. Until then it cancels main(), so scanning and
+        # connect retries stop right away. add_signal_handler is unavailable
+        # on Windows, where Ctrl+C always cancels main().
+        with contextlib.suppress(NotImplementedError):
+            loop.add_signal_handler(signal.SIGINT, stop_event.set)
         print("\nConnected! Streaming live data. Press Ctrl+C to stop...\n")
 
-        # Keep the connection active
-        while True:
-            await asyncio.sleep(1)
+        # Keep the connection active until Ctrl+C
+        await stop_event.wait()
+        print("\nStopping stream...")
 
     except asyncio.CancelledError:
         print("\nStopping stream...")
     except Exception as e:
         print(f"\nError: {e}")
     finally:
+        print_task.cancel()
+        _drain_pending()
+        if not verbose:
+            _write_status()
+        received = ", ".join(f"{k.upper()} {n}" for k, n in packet_counts.items() if n)
+        if received:
+            print(f"\nPackets received: {received}")
+        if dropped:
+            print(f"\n({dropped} updates dropped while the console lagged)")
+        with contextlib.suppress(NotImplementedError):
+            loop.remove_signal_handler(signal.SIGINT)
         print("Disconnecting device...")
         await connector.stop_notify()
         print("Disconnected.")
 
 
 if __name__ == "__main__":
+    use_uvloop()
     try:
         asyncio.run(main())
     except KeyboardInterrupt:
@@ -11,8 +11,10 @@ from __future__ import annotations
 
 import argparse
 import os
+import shutil
 import sys
 import zipfile
+from concurrent.futures import ThreadPoolExecutor
 
 DATASET_LAYOUT = {
     "WESAD": "WESAD",
@@ -20,6 +22,12 @@ DATASET_LAYOUT = {
     "UBFC-Phys": "UBFC-Phys",
 }
 
+# Members are extracted in parallel; zlib releases the GIL while inflating.
+EXTRACT_WORKERS = 4
+# Copy buffer per member; the 16 KiB default makes many small syscalls on
+# multi-gigabyte archives such as WESAD.
+COPY_BUFFER_SIZE = 1 << 20
+
 
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(
@@ -49,7 +57,12 @@ def ensure_dir(path: str) -> None:
 
 
 def is_non_empty_dir(path: str) -> bool:
-    return os.path.isdir(path) and any(os.scandir(path))
+    if not os.path.isdir(path):
+        return False
+    # Close the directory handle right after the first entry instead of
+    # leaving the scandir iterator for the garbage collector.
+    with os.scandir(path) as entries:
+        return next(entries, None) is not None
 
 
 def verify_layout(base_dir: str) -> dict[str, bool]:
@@ -60,6 +73,47 @@ def verify_layout(base_dir: str) -> dict[str, bool]:
     return status
 
 
+_WINDOWS_ILLEGAL = str.maketrans(':<>|"?*', "_______")
+
+
+def member_path(info: zipfile.ZipInfo, base_dir: str) -> str:
+    """Target path for an archive member, built the way ZipFile.extract does.
+
+    Drive letters, absolute prefixes and ``.``/``..`` parts are dropped; on
+    Windows, illegal characters become ``_`` and trailing dots are removed.
+    """
+    arcname = info.filename.replace("/", os.path.sep)
+    if os.path.altsep:
+        arcname = arcname.replace(os.path.altsep, os.path.sep)
+    arcname = os.path.splitdrive(arcname)[1]
+    invalid_parts = ("", os.path.curdir, os.path.pardir)
+    parts = [x for x in arcname.split(os.path.sep) if x not in invalid_parts]
+    if os.path.sep == "\\":
+        parts = [x.translate(_WINDOWS_ILLEGAL).rstrip(".") for x in parts]
+        parts = [x for x in parts if x]
+    return os.path.normpath(os.path.join(base_dir, *parts))
+
+
+def extract_member(
+    zip_ref: zipfile.ZipFile, info: zipfile.ZipInfo, base_dir: str
+) -> None:
+    """Extract one archive member; safe to call from several threads."""
+    root = os.path.realpath(base_dir)
+    target = os.path.realpath(member_path(info, root))
+    if os.path.commonpath([root, target]) != root:
+        raise ValueError(f"Refusing to extract outside {base_dir}: {info.filename}")
+    if info.is_dir():
+        os.makedirs(target, exist_ok=True)
+        return
+    # exist_ok: sibling members may create the same folder concurrently.
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    with (
+        zip_ref.open(info) as src,
+        open(target, "wb", buffering=COPY_BUFFER_SIZE) as dst,
+    ):
+        shutil.copyfileobj(src, dst, length=COPY_BUFFER_SIZE)
+
+
 def extract_archives(base_dir: str) -> None:
     archive_dirs = [base_dir, os.path.join(base_dir, "archives")]
     extracted = False
@@ -67,13 +121,23 @@ def extract_archives(base_dir: str) -> None:
     for archive_dir in archive_dirs:
         if not os.path.isdir(archive_dir):
             continue
-        for entry in os.listdir(archive_dir):
-            if not entry.lower().endswith(".zip"):
-                continue
-            zip_path = os.path.join(archive_dir, entry)
+        with os.scandir(archive_dir) as entries:
+            zip_paths = [
+                entry.path
+                for entry in entries
+                if entry.name.lower().endswith(".zip") and entry.is_file()
+            ]
+        for zip_path in zip_paths:
             print(f"Extracting {zip_path}...")
             with zipfile.ZipFile(zip_path, "r") as zip_ref:
-                zip_ref.extractall(base_dir)
+                with ThreadPoolExecutor(max_workers=EXTRACT_WORKERS) as pool:
+                    # list() surfaces the first extraction error, if any.
+                    list(
+                        pool.map(
+                            lambda info: extract_member(zip_ref, info, base_dir),
+                            zip_ref.infolist(),
+                        )
+                    )
             extracted = True
 
     if not extracted:
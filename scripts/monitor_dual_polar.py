@@ -3,7 +3,6 @@ from __future__ import annotations
 # ruff: noqa: E402
 import argparse
 import asyncio
-import csv
 import sys
 import time
 from collections import deque
@@ -21,11 +20,17 @@ from rich.table import Table
 from rich.text import Text
 
 from polar_ble_sdk.connector.ble_discovery import discover_dual_polar_devices
+from polar_ble_sdk.connector.event_loop import use_uvloop
 from polar_ble_sdk.connector.stream import create_polar_connector
 from polar_ble_sdk.dashboard_utils import (
-    calculate_rmssd,
+    CsvLogger,
     draw_sparkline,
+    format_last_sample,
+    format_timestamp,
+    make_hr_callback,
+    make_sample_callback,
     read_battery,
+    update_battery_loop,
     update_hz_for_state,
 )
 
@@ -72,9 +77,9 @@ state_h10: dict[str, Any] = {
     "rr_intervals": [],
     "hr_history": deque(maxlen=40),
     "rr_history": deque(maxlen=50),
+    "rmssd": 0.0,
     "acc_count": 0,
     "acc_hz": 0.0,
-    "acc_last_sample": "-",
     "acc_raw": (0.0, 0.0, 0.0),
     "battery": "-",
     "csv_path": "-",
@@ -89,20 +94,18 @@ state_sense: dict[str, Any] = {
     "rr_intervals": [],
     "hr_history": deque(maxlen=40),
     "rr_history": deque(maxlen=50),
+    "rmssd": 0.0,
     "ppg_count": 0,
     "ppg_hz": 0.0,
-    "ppg_last_sample": "-",
+    "ppg_raw": None,
     "acc_count": 0,
     "acc_hz": 0.0,
-    "acc_last_sample": "-",
     "acc_raw": (0.0, 0.0, 0.0),
     "gyro_count": 0,
     "gyro_hz": 0.0,
-    "gyro_last_sample": "-",
     "gyro_raw": (0.0, 0.0, 0.0),
     "mag_count": 0,
     "mag_hz": 0.0,
-    "mag_last_sample": "-",
     "mag_raw": (0.0, 0.0, 0.0),
     "battery": "-",
     "csv_path": "-",
@@ -121,87 +124,19 @@ sense_mag_ts: deque[tuple[float, int]] = deque(maxlen=20)
 
 
 # Callbacks for H10
-def hr_callback_h10(data):
-    if isinstance(data, tuple) and len(data) >= 2:
-        hr_val, rr_ints = data
-        if hr_val > 0:
-            state_h10["hr"] = hr_val
-            state_h10["hr_history"].append(hr_val)
-        if rr_ints:
-            state_h10["rr_intervals"] = rr_ints
-            state_h10["rr_history"].extend(rr_ints)
-
-
-def acc_callback_h10(data):
-    timestamp, samples = data
-    state_h10["acc_count"] += len(samples)
-    t = time.time()
-    h10_acc_ts.append((t, len(samples)))
-    last_val = samples[-1]
-    state_h10["acc_raw"] = (last_val[0], last_val[1], last_val[2])
-    state_h10["acc_last_sample"] = (
-        f"({last_val[0]:+4d}, {last_val[1]:+4d}, {last_val[2]:+4d}) mg"
-    )
-
+hr_callback_h10 = make_hr_callback(state_h10)
+acc_callback_h10 = make_sample_callback(state_h10, "acc", h10_acc_ts)
 
 # Callbacks for Verity Sense
-def hr_callback_sense(data):
-    if isinstance(data, tuple) and len(data) >= 2:
-        hr_val, rr_ints = data
-        if hr_val > 0:
-            state_sense["hr"] = hr_val
-            state_sense["hr_history"].append(hr_val)
-        if rr_ints:
-            state_sense["rr_intervals"] = rr_ints
-            state_sense["rr_history"].extend(rr_ints)
-
-
-def ppg_callback_sense(data):
-    timestamp, samples = data
-    state_sense["ppg_count"] += len(samples)
-    t = time.time()
-    sense_ppg_ts.append((t, len(samples)))
-    state_sense["ppg_last_sample"] = str(samples[-1])
-
-
-def acc_callback_sense(data):
-    timestamp, samples = data
-    state_sense["acc_count"] += len(samples)
-    t = time.time()
-    sense_acc_ts.append((t, len(samples)))
-    last_val = samples[-1]
-    state_sense["acc_raw"] = (last_val[0], last_val[1], last_val[2])
-    state_sense["acc_last_sample"] = (
-        f"({last_val[0]:+4d}, {last_val[1]:+4d}, {last_val[2]:+4d}) mg"
-    )
-
-
-def gyro_callback_sense(data):
-    timestamp, samples = data
-    state_sense["gyro_count"] += len(samples)
-    t = time.time()
-    sense_gyro_ts.append((t, len(samples)))
-    last_val = samples[-1]
-    state_sense["gyro_raw"] = (last_val[0], last_val[1], last_val[2])
-    state_sense["gyro_last_sample"] = (
-        f"({last_val[0]:+4.1f}, {last_val[1]:+4.1f}, {last_val[2]:+4.1f}) dps"
-    )
-
-
-def mag_callback_sense(data):
-    timestamp, samples = data
-    state_sense["mag_count"] += len(samples)
-    t = time.time()
-    sense_mag_ts.append((t, len(samples)))
-    last_val = samples[-1]
-    state_sense["mag_raw"] = (last_val[0], last_val[1], last_val[2])
-    state_sense["mag_last_sample"] = (
-        f"({last_val[0]:+3.1f}, {last_val[1]:+3.1f}, {last_val[2]:+3.1f}) uT"
-    )
+hr_callback_sense = make_hr_callback(state_sense)
+ppg_callback_sense = make_sample_callback(state_sense, "ppg", sense_ppg_ts)
+acc_callback_sense = make_sample_callback(state_sense, "acc", sense_acc_ts)
+gyro_callback_sense = make_sample_callback(state_sense, "gyro", sense_gyro_ts)
+mag_callback_sense = make_sample_callback(state_sense, "mag", sense_mag_ts)
 
 
 def update_hz():
-    now = time.time()
+    now = time.monotonic()
     update_hz_for_state(state_h10, ("acc", h10_acc_ts), now=now)
     update_hz_for_state(
         state_sense,
@@ -221,7 +156,7 @@ def build_device_panel(state: dict, is_h10: bool) -> Panel:
     elif state["hr"] > 55:
         hr_color = "bold green"
 
-    rmssd = calculate_rmssd(state["rr_history"])
+    rmssd = state["rmssd"]
 
     hr_text = Text()
     if state["address"] == "-":
@@ -275,7 +210,7 @@ def build_device_panel(state: dict, is_h10: bool) -> Panel:
             "ACC",
             acc_status,
             f"{state['acc_hz']:.1f} Hz",
-            state["acc_last_sample"],
+            format_last_sample(state, "acc"),
         )
     else:
         streams_table.add_row(
@@ -289,28 +224,28 @@ def build_device_panel(state: dict, is_h10: bool) -> Panel:
             "PPG",
             ppg_status,
             f"{state['ppg_hz']:.1f} Hz",
-            state["ppg_last_sample"],
+            format_last_sample(state, "ppg"),
         )
         acc_status = "Active" if state["acc_hz"] > 0 else "Inactive"
         streams_table.add_row(
             "ACC",
             acc_status,
             f"{state['acc_hz']:.1f} Hz",
-            state["acc_last_sample"],
+            format_last_sample(state, "acc"),
         )
         gyro_status = "Active" if state["gyro_hz"] > 0 else "Inactive"
         streams_table.add_row(
             "GYRO",
             gyro_status,
             f"{state['gyro_hz']:.1f} Hz",
-            state["gyro_last_sample"],
+            format_last_sample(state, "gyro"),
         )
         mag_status = "Active" if state["mag_hz"] > 0 else "Inactive"
         streams_table.add_row(
             "MAG",
             mag_status,
             f"{state['mag_hz']:.1f} Hz",
-            state["mag_last_sample"],
+            format_last_sample(state, "mag"),
         )
 
     device_info = Text()
@@ -368,14 +303,6 @@ def build_dual_dashboard(elapsed: float) -> Panel:
     )
 
 
-async def _battery_loop(conn, state_dict):
-    """Background battery refresh, updating the given state dict."""
-    while True:
-        if conn and conn.polar_device and conn.polar_device._client:
-            state_dict["battery"] = await read_battery(conn)
-        await asyncio.sleep(30)
-
-
 async def main():
     parser = argparse.ArgumentParser(description="Dual Polar Terminal Dashboard")
     parser.add_argument("--h10", type=str, default=None, help="MAC/Name of H10 strap")
@@ -429,7 +356,7 @@ async def main():
 
     with Live(build_dual_dashboard(0.0), refresh_per_second=10) as live:
         h10_dev, sense_dev = await discover_dual_polar_devices(
-            args.h10, args.sense, timeout=10.0
+            args.h10, args.sense, timeout=10.0, partner_timeout=5.0
         )
 
         # Update address state
@@ -459,6 +386,9 @@ async def main():
         conn_h10 = None
         conn_sense = None
         tasks = []
+        battery_tasks: list[asyncio.Task] = []
+        h10_logger: CsvLogger | None = None
+        sense_logger: CsvLogger | None = None
 
         # Collect dynamic rate/range configurations if specified
         custom_kwargs = {}
@@ -475,6 +405,10 @@ async def main():
         if args.ppg_rate is not None:
             custom_kwargs["ppg_sample_rate"] = args.ppg_rate
 
+        # Both connectors still stream in parallel, but connect + GATT
+        # discovery run one at a time instead of contending on the BLE stack.
+        custom_kwargs["connect_lock"] = asyncio.Lock()
+
         # Setup H10
         if h10_dev:
             conn_h10 = create_polar_connector(
@@ -505,91 +439,94 @@ async def main():
             # Connect in parallel
             await asyncio.gather(*tasks)
 
-            if conn_h10:
-                state_h10["status"] = "Connected! Streaming data."
-                state_h10["battery"] = await read_battery(conn_h10)
-
-            if conn_sense:
-                state_sense["status"] = "Connected! Streaming data."
-                state_sense["battery"] = await read_battery(conn_sense)
-
-            # Setup CSV loggers
-            csv_path_h10 = None
-            csv_path_sense = None
-            log_dir = PROJECT_ROOT / "data"
-            log_dir.mkdir(exist_ok=True)
-
-            timestamp_str = time.strftime("%Y%m%d_%H%M%S")
+            connected = [
+                (conn, dev_state)
+                for conn, dev_state in (
+                    (conn_h10, state_h10),
+                    (conn_sense, state_sense),
+                )
+                if conn
+            ]
+            for _, dev_state in connected:
+                dev_state["status"] = "Connected! Streaming data."
+            # Both devices answer their battery reads concurrently.
+            levels = await asyncio.gather(
+                *(read_battery(conn) for conn, _ in connected)
+            )
+            for (_, dev_state), level in zip(connected, levels):
+                dev_state["battery"] = level
 
+            # Setup CSV loggers (files stay open for the whole session;
+            # write_header creates the log directory on first use)
             if not args.no_log:
+                log_dir = PROJECT_ROOT / "data"
+                timestamp_str = time.strftime("%Y%m%d_%H%M%S")
+
                 if conn_h10:
-                    csv_path_h10 = log_dir / f"dual_session_h10_{timestamp_str}.csv"
-                    state_h10["csv_path"] = str(csv_path_h10)
-                    with open(
-                        csv_path_h10, mode="w", newline="", encoding="utf-8"
-                    ) as f:
-                        csv.writer(f).writerow(H10_CSV_COLUMNS)
+                    h10_logger = CsvLogger(
+                        log_dir / f"dual_session_h10_{timestamp_str}.csv",
+                        H10_CSV_COLUMNS,
+                    )
+                    h10_logger.write_header()
+                    state_h10["csv_path"] = h10_logger.path_str
 
                 if conn_sense:
-                    csv_path_sense = log_dir / f"dual_session_sense_{timestamp_str}.csv"
-                    state_sense["csv_path"] = str(csv_path_sense)
-                    with open(
-                        csv_path_sense, mode="w", newline="", encoding="utf-8"
-                    ) as f:
-                        csv.writer(f).writerow(SENSE_CSV_COLUMNS)
+                    sense_logger = CsvLogger(
+                        log_dir / f"dual_session_sense_{timestamp_str}.csv",
+                        SENSE_CSV_COLUMNS,
+                    )
+                    sense_logger.write_header()
+                    state_sense["csv_path"] = sense_logger.path_str
 
             # Battery update tasks
-            battery_tasks = []
             if conn_h10:
                 battery_tasks.append(
-                    asyncio.create_task(_battery_loop(conn_h10, state_h10))
+                    asyncio.create_task(update_battery_loop(conn_h10, state_h10))
                 )
             if conn_sense:
                 battery_tasks.append(
-                    asyncio.create_task(_battery_loop(conn_sense, state_sense))
+                    asyncio.create_task(update_battery_loop(conn_sense, state_sense))
                 )
 
-            start_time = time.time()
+            start_time = time.monotonic()
             last_log_time = start_time
 
             while True:
-                elapsed = time.time() - start_time
-                now = time.time()
+                now = time.monotonic()
+                elapsed = now - start_time
 
                 # Log metrics to CSV at 1 Hz
                 if (now - last_log_time) >= 1.0:
                     last_log_time = now
+                    # One wall-clock stamp per tick, shared by both devices' rows.
+                    row_stamp = format_timestamp()
 
                     # H10 CSV Log
-                    if csv_path_h10:
+                    if h10_logger:
                         ax, ay, az = (
                             state_h10["acc_raw"]
                             if state_h10["acc_count"] > 0
                             else (None, None, None)
                         )
                         try:
-                            with open(
-                                csv_path_h10, mode="a", newline="", encoding="utf-8"
-                            ) as f:
-                                writer = csv.writer(f)
-                                writer.writerow(
-                                    [
-                                        time.strftime("%Y-%m-%d %H:%M:%S"),
-                                        state_h10["hr"],
-                                        calculate_rmssd(state_h10["rr_history"]),
-                                        state_h10["battery"],
-                                        ax,
-                                        ay,
-                                        az,
-                                    ]
-                                )
-                            state_h10["csv_rows_written"] += 1
+                            h10_logger.write_row(
+                                [
+                                    row_stamp,
+                                    state_h10["hr"],
+                                    state_h10["rmssd"],
+                                    state_h10["battery"],
+                                    ax,
+                                    ay,
+                                    az,
+                                ]
+                            )
+                            state_h10["csv_rows_written"] = h10_logger.rows_written
                         except Exception:
                             pass
 
                     # Sense CSV Log
-                    if csv_path_sense:
-                        ppg = state_sense["ppg_last_sample"]
+                    if sense_logger:
+                        ppg = format_last_sample(state_sense, "ppg")
                         ax, ay, az = (
                             state_sense["acc_raw"]
                             if state_sense["acc_count"] > 0
@@ -606,29 +543,25 @@ async def main():
                             else (None, None, None)
                         )
                         try:
-                            with open(
-                                csv_path_sense, mode="a", newline="", encoding="utf-8"
-                            ) as f:
-                                writer = csv.writer(f)
-                                writer.writerow(
-                                    [
-                                        time.strftime("%Y-%m-%d %H:%M:%S"),
-                                        state_sense["hr"],
-                                        calculate_rmssd(state_sense["rr_history"]),
-                                        state_sense["battery"],
-                                        ppg,
-                                        ax,
-                                        ay,
-                                        az,
-                                        gx,
-                                        gy,
-                                        gz,
-                                        mx,
-                                        my,
-                                        mz,
-                                    ]
-                                )
-                            state_sense["csv_rows_written"] += 1
+                            sense_logger.write_row(
+                                [
+                                    row_stamp,
+                                    state_sense["hr"],
+                                    state_sense["rmssd"],
+                                    state_sense["battery"],
+                                    ppg,
+                                    ax,
+                                    ay,
+                                    az,
+                                    gx,
+                                    gy,
+                                    gz,
+                                    mx,
+                                    my,
+                                    mz,
+                                ]
+                            )
+                            state_sense["csv_rows_written"] = sense_logger.rows_written
                         except Exception:
                             pass
 
@@ -653,6 +586,9 @@ async def main():
 
             for bt in battery_tasks:
                 bt.cancel()
+            for logger in (h10_logger, sense_logger):
+                if logger:
+                    logger.close()
 
             cleanup_tasks = []
             if conn_h10:
@@ -672,6 +608,7 @@ async def main():
 
 
 if __name__ == "__main__":
+    use_uvloop()
     try:
         asyncio.run(main())
     except KeyboardInterrupt:
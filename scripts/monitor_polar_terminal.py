@@ -9,8 +9,10 @@ PROJECT_ROOT = Path(__file__).resolve().parents[1]
 sys.path.append(str(PROJECT_ROOT / "src"))
 
 from polar_ble_sdk.cli import main
+from polar_ble_sdk.connector.event_loop import use_uvloop
 
 if __name__ == "__main__":
+    use_uvloop()
     try:
         asyncio.run(main())
     except KeyboardInterrupt:
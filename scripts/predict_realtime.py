@@ -9,37 +9,219 @@ The CSV should contain two columns: eda, hr (one sample per row).
 
 import argparse
 import os
+from functools import lru_cache
 
 import joblib
 import numpy as np
-import pandas as pd
+import torch
 from pytorch_tabnet.tab_model import TabNetClassifier
 
+try:
+    from numba import njit
+except ImportError:  # pragma: no cover - optional dependency
+    njit = None  # type: ignore[assignment]
 
-def extract_features(eda_signal: np.ndarray, hr_signal: np.ndarray) -> np.ndarray:
-    def stats(x: np.ndarray) -> list:
-        mean = np.mean(x)
-        median = np.median(x)
-        std = np.std(x)
-        var = np.var(x)
-        min_v = np.min(x)
-        max_v = np.max(x)
-        skew = pd.Series(x).skew()
-        kurt = pd.Series(x).kurt()
-        dyn_range = max_v - min_v
-        return [mean, median, std, var, min_v, max_v, skew, kurt, dyn_range]
-
-    eda_feats = stats(eda_signal)
-    hr_feats = stats(hr_signal)
-
-    cov = np.cov(eda_signal, hr_signal)[0, 1]
-    skin_resistance = np.mean(1.0 / (eda_signal + 1e-6))
-    hrv = np.std(hr_signal)
-
-    features = np.array(
-        eda_feats + hr_feats + [cov, skin_resistance, hrv], dtype=np.float32
-    )
-    return np.nan_to_num(features, nan=0.0, posinf=0.0, neginf=0.0)
+try:
+    import pyarrow as pa
+    from pyarrow import csv as pa_csv
+except ImportError:  # pragma: no cover - optional dependency
+    pa = None
+
+# 9 statistics per signal (EDA, HR) + covariance, skin resistance, HRV.
+N_FEATURES = 21
+
+
+_EPS = float(np.finfo(np.float64).eps)
+
+
+def _skew_kurt(
+    centered: np.ndarray, min_v: np.ndarray, max_v: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """Bias-corrected skewness and excess kurtosis per row, as pandas computes them."""
+    n = centered.shape[1]
+    nan = np.full(centered.shape[0], np.nan)
+    if n < 3:
+        return nan, nan
+    d = centered
+    d2 = d * d
+    m2 = d2.sum(axis=1)
+    # Constant rows report 0, like pandas. Their mean is rarely exact, so m2
+    # keeps rounding noise: test the range and pandas' float error bound.
+    max_abs = np.maximum(np.abs(min_v), np.abs(max_v))
+    flat = (max_v == min_v) | (m2 <= n * (_EPS * max_abs) ** 2)
+    m2 = np.where(flat, 1.0, m2)
+    skew = n * np.sqrt(n - 1) / (n - 2) * (d2 * d).sum(axis=1) / m2**1.5
+    skew[flat] = 0.0
+    if n < 4:
+        return skew, nan
+    kurt = n * (n + 1) * (n - 1) * (d2 * d2).sum(axis=1) / (
+        (n - 2) * (n - 3) * m2 * m2
+    ) - 3 * (n - 1) ** 2 / ((n - 2) * (n - 3))
+    kurt[flat] = 0.0
+    return skew, kurt
+
+
+def _signal_stats(x, out, k):
+    """Write the 9 per-signal statistics to ``out[k:k + 9]``; returns the mean."""
+    n = x.size
+    mean = x.sum() / n
+    m2 = m3 = m4 = 0.0
+    lo = hi = x[0]
+    for v in x:
+        d = v - mean
+        d2 = d * d
+        m2 += d2
+        m3 += d2 * d
+        m4 += d2 * d2
+        lo = min(lo, v)
+        hi = max(hi, v)
+    var = m2 / n
+    out[k] = mean
+    out[k + 1] = np.median(x)
+    out[k + 2] = np.sqrt(var)
+    out[k + 3] = var
+    out[k + 4] = lo
+    out[k + 5] = hi
+    # Bias-corrected skewness / excess kurtosis, matching _skew_kurt.
+    flat = hi == lo or m2 <= n * (_EPS * max(abs(lo), abs(hi))) ** 2
+    if n < 3:
+        out[k + 6] = np.nan
+    elif flat:
+        out[k + 6] = 0.0
+    else:
+        out[k + 6] = n * np.sqrt(n - 1.0) / (n - 2.0) * m3 / m2**1.5
+    if n < 4:
+        out[k + 7] = np.nan
+    elif flat:
+        out[k + 7] = 0.0
+    else:
+        out[k + 7] = n * (n + 1.0) * (n - 1.0) * m4 / (
+            (n - 2.0) * (n - 3.0) * m2 * m2
+        ) - 3.0 * (n - 1.0) ** 2 / ((n - 2.0) * (n - 3.0))
+    out[k + 8] = hi - lo
+    return mean
+
+
+def _fill_features(eda, hr, out):
+    """Single-pass-per-signal feature kernel, compiled with numba when available."""
+    n = eda.size
+    eda_mean = _signal_stats(eda, out, 0)
+    hr_mean = _signal_stats(hr, out, 9)
+    cov = 0.0
+    inv_sum = 0.0
+    for i in range(n):
+        cov += (eda[i] - eda_mean) * (hr[i] - hr_mean)
+        inv_sum += 1.0 / (eda[i] + 1e-6)
+    out[18] = cov / (n - 1) if n > 1 else np.nan
+    out[19] = inv_sum / n
+    out[20] = out[11]  # HRV: std of HR
+    for i in range(out.size):
+        if not np.isfinite(out[i]):
+            out[i] = 0.0
+
+
+if njit is not None:
+    # No fastmath: it would let LLVM assume the NaN/inf checks away.
+    _signal_stats = njit(cache=True)(_signal_stats)
+    _fill_features = njit(cache=True)(_fill_features)
+
+
+def extract_features(
+    eda_signal: np.ndarray, hr_signal: np.ndarray, out: np.ndarray | None = None
+) -> np.ndarray:
+    """Compute the window's feature vector, writing into ``out`` when given.
+
+    ``out`` is a float32 array of ``N_FEATURES`` (e.g. a row of a batch
+    matrix) that a streaming caller can reuse across windows. With numba
+    installed the whole vector comes from one compiled kernel.
+    """
+    if out is None:
+        out = np.empty(N_FEATURES, dtype=np.float32)
+    if njit is not None:
+        eda64 = np.asarray(eda_signal, dtype=np.float64)
+        hr64 = np.asarray(hr_signal, dtype=np.float64)
+        if eda64.shape != hr64.shape or eda64.ndim != 1 or eda64.size == 0:
+            raise ValueError("EDA and HR windows must be non-empty and equally long.")
+        _fill_features(eda64, hr64, out)
+        return out
+    # Stack both signals as (2, N) so each statistic is one axis=1 reduction
+    # covering EDA and HR together.
+    signals = np.vstack([eda_signal, hr_signal])
+    n = signals.shape[1]
+    mean = signals.mean(axis=1, dtype=np.float64)
+    # Centered once in float64 and shared by skew/kurtosis and the covariance.
+    centered = signals - mean[:, None]
+    var = signals.var(axis=1)
+    min_v = signals.min(axis=1)
+    max_v = signals.max(axis=1)
+    skew, kurt = _skew_kurt(centered, min_v, max_v)
+
+    # out[:18] viewed as (2, 9): one row of statistics per signal.
+    per_signal = out[:18].reshape(2, 9)
+    per_signal[:, 0] = mean
+    per_signal[:, 1] = np.median(signals, axis=1)
+    per_signal[:, 2] = np.sqrt(var)
+    per_signal[:, 3] = var
+    per_signal[:, 4] = min_v
+    per_signal[:, 5] = max_v
+    per_signal[:, 6] = skew
+    per_signal[:, 7] = kurt
+    per_signal[:, 8] = max_v - min_v
+
+    out[18] = centered[0] @ centered[1] / (n - 1) if n > 1 else np.nan  # cov
+    # Skin resistance: mean reciprocal conductance, reusing one temporary.
+    inv_eda = eda_signal + 1e-6
+    out[19] = np.reciprocal(inv_eda, out=inv_eda).mean()
+    out[20] = per_signal[1, 2]  # HRV: std of HR, reused from the stacked stats
+    return np.nan_to_num(out, copy=False, nan=0.0, posinf=0.0, neginf=0.0)
+
+
+@lru_cache(maxsize=1)
+def load_artifacts(model_path: str, scaler_path: str, quantize: bool = True):
+    """Load the TabNet model and scaler once per path pair and reuse them.
+
+    With ``quantize`` the network's Linear layers get int8 dynamic
+    quantization for CPU inference; the scaler stays float32.
+    """
+    scaler = joblib.load(scaler_path)
+    model = TabNetClassifier()
+    model.load_model(model_path)
+    model.network.eval()
+    if quantize and torch.device(model.device).type == "cpu":
+        engines = torch.backends.quantized.supported_engines
+        if "fbgemm" in engines:
+            torch.backends.quantized.engine = "fbgemm"
+        if torch.backends.quantized.engine != "none":
+            model.network = torch.quantization.quantize_dynamic(
+                model.network, {torch.nn.Linear}, dtype=torch.qint8
+            )
+    return model, scaler
+
+
+_LABELS = ("Non-Stress", "Stress")
+
+
+def predict_windows(
+    windows: list[tuple[np.ndarray, np.ndarray]], model, scaler
+) -> list[tuple[str, np.ndarray]]:
+    """Classify several EDA/HR windows with one scaler and one TabNet call."""
+    if not windows:
+        return []
+    feats = np.empty((len(windows), N_FEATURES), dtype=np.float32)
+    for i, (eda, hr) in enumerate(windows):
+        extract_features(eda, hr, out=feats[i])
+    # Inference only: skip autograd bookkeeping on the forward pass.
+    with torch.inference_mode():
+        proba = model.predict_proba(scaler.transform(feats))
+    preds = np.argmax(proba, axis=1)
+    return [(_LABELS[int(p == 1)], row) for p, row in zip(preds, proba)]
+
+
+def predict_window(
+    eda: np.ndarray, hr: np.ndarray, model, scaler
+) -> tuple[str, np.ndarray]:
+    """Classify one EDA/HR window with already loaded artifacts."""
+    return predict_windows([(eda, hr)], model, scaler)[0]
 
 
 def parse_args() -> argparse.Namespace:
@@ -57,34 +239,54 @@ def parse_args() -> argparse.Namespace:
         default=os.path.join("models", "tabnet_stress_scaler.joblib"),
         help="Scaler joblib path",
     )
+    parser.add_argument(
+        "--no-quantize",
+        action="store_true",
+        help="Run the model in float32 instead of int8 dynamic quantization",
+    )
     return parser.parse_args()
 
 
-def main() -> None:
-    args = parse_args()
-
-    if not os.path.isfile(args.window_csv):
-        raise FileNotFoundError(f"Window CSV not found: {args.window_csv}")
+def read_window_csv(path: str) -> tuple[np.ndarray, np.ndarray]:
+    """Read the ``eda``/``hr`` columns of a window CSV as float32 arrays."""
+    if pa is not None:
+        table = pa_csv.read_csv(
+            path,
+            convert_options=pa_csv.ConvertOptions(
+                column_types={"eda": pa.float32(), "hr": pa.float32()}
+            ),
+        )
+        columns = table.schema.names
+    else:
+        import pandas as pd
 
-    df = pd.read_csv(args.window_csv)
-    if not {"eda", "hr"}.issubset(df.columns):
+        table = pd.read_csv(path, dtype={"eda": np.float32, "hr": np.float32})
+        columns = table.columns
+    if not {"eda", "hr"}.issubset(columns):
         raise ValueError("CSV must include 'eda' and 'hr' columns.")
+    if pa is not None:
+        # Copies only if the column is chunked or has missing values (-> NaN).
+        return (
+            table.column("eda").to_numpy(zero_copy_only=False),
+            table.column("hr").to_numpy(zero_copy_only=False),
+        )
+    return table["eda"].to_numpy(), table["hr"].to_numpy()
 
-    eda = df["eda"].to_numpy(dtype=np.float32)
-    hr = df["hr"].to_numpy(dtype=np.float32)
 
-    features = extract_features(eda, hr).reshape(1, -1)
-
-    scaler = joblib.load(args.scaler_path)
-    features = scaler.transform(features)
+def main() -> None:
+    args = parse_args()
 
-    model = TabNetClassifier()
-    model.load_model(args.model_path)
+    if not os.path.isfile(args.window_csv):
+        raise FileNotFoundError(f"Window CSV not found: {args.window_csv}")
 
-    proba = model.predict_proba(features)[0]
-    pred = int(np.argmax(proba))
+    eda, hr = read_window_csv(args.window_csv)
+    # One window at a time: intra-op threading costs more than it saves.
+    torch.set_num_threads(1)
 
-    label = "Stress" if pred == 1 else "Non-Stress"
+    model, scaler = load_artifacts(
+        args.model_path, args.scaler_path, quantize=not args.no_quantize
+    )
+    label, proba = predict_window(eda, hr, model, scaler)
     print(f"Prediction: {label} | proba={proba}")
 
 
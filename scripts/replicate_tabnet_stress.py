@@ -9,10 +9,13 @@ Replicable TabNet-based Stress Detection System (Jui et al., 2026)
 import argparse
 import os
 import pickle
+from concurrent.futures import ProcessPoolExecutor
 
 import numpy as np
 import pandas as pd
 import joblib
+from joblib import Parallel, delayed
+from numpy.lib.stride_tricks import sliding_window_view
 
 from sklearn.datasets import make_classification
 from sklearn.preprocessing import StandardScaler
@@ -29,58 +32,98 @@ VALID_LABELS = {1, 2, 3, 4}
 STRESS_LABEL = 2
 SWELL_STRESS_CONDITIONS = {"T", "I"}
 
+try:
+    from numba import njit
+except ImportError:  # pragma: no cover - optional dependency
+    njit = None
+
+
+def _select_peaks(
+    signal: np.ndarray, candidates: np.ndarray, min_distance: int
+) -> np.ndarray:
+    """
+    Enforce the refractory period on candidate peak indices, keeping the
+    higher sample when two candidates are closer than min_distance.
+    Compiled with numba when available.
+    """
+    peaks = np.empty(candidates.size, dtype=np.int64)
+    count = 0
+    last_peak = -min_distance
+    for idx in candidates:
+        if idx - last_peak < min_distance:
+            if count > 0 and signal[idx] > signal[peaks[count - 1]]:
+                peaks[count - 1] = idx
+                last_peak = idx
+            continue
+        peaks[count] = idx
+        count += 1
+        last_peak = idx
+    return peaks[:count]
+
+
+if njit is not None:
+    # nogil lets per-subject peak detection run in parallel threads.
+    _select_peaks = njit(cache=True, nogil=True)(_select_peaks)
+
 
 def detect_r_peaks(ecg: np.ndarray, fs: int) -> np.ndarray:
     """
     Simple R-peak detection for ECG.
     This is a lightweight heuristic to estimate HR without external dependencies.
     """
-    signal = np.asarray(ecg, dtype=np.float64).squeeze()
+    signal = np.asarray(ecg, dtype=np.float32).squeeze()
     if signal.size < 3:
         return np.array([], dtype=np.int64)
 
     signal = (signal - np.mean(signal)) / (np.std(signal) + 1e-8)
-    threshold = np.percentile(signal, 90)
-    candidates = np.where(signal > threshold)[0]
+    # 90th percentile (linear interpolation, as np.percentile) from a partial
+    # sort of just the two bracketing order statistics.
+    position = 0.9 * (signal.size - 1)
+    k = int(position)
+    ordered = np.partition(signal, [k, k + 1])
+    threshold = ordered[k] + (ordered[k + 1] - ordered[k]) * (position - k)
+    # Vectorized prefilter: keep only interior local maxima above the threshold,
+    # so the peak loop only resolves the refractory-period spacing.
+    center = signal[1:-1]
+    is_peak = (center > threshold) & (center > signal[:-2]) & (center >= signal[2:])
+    candidates = np.flatnonzero(is_peak) + 1
 
-    peaks = []
-    min_distance = int(0.3 * fs)
-    last_peak = -min_distance
-
-    for idx in candidates:
-        if idx <= 0 or idx >= signal.size - 1:
-            continue
-        if signal[idx] <= signal[idx - 1] or signal[idx] < signal[idx + 1]:
-            continue
-        if idx - last_peak < min_distance:
-            if peaks and signal[idx] > signal[peaks[-1]]:
-                peaks[-1] = idx
-                last_peak = idx
-            continue
-        peaks.append(idx)
-        last_peak = idx
-
-    return np.asarray(peaks, dtype=np.int64)
+    return _select_peaks(signal, candidates, int(0.3 * fs))
 
 
 def ecg_to_hr(ecg: np.ndarray, fs: int) -> np.ndarray:
     """
     Estimate an HR signal from ECG using R-peak detection and interpolation.
-    Returns a per-sample HR signal (bpm) aligned to ECG length.
+    Returns a per-sample HR signal (bpm) aligned to ECG length, the same
+    per-sample semantics as the SWELL HR column and predict_realtime.py.
     """
     peaks = detect_r_peaks(ecg, fs)
     if peaks.size < 2:
-        return np.zeros_like(ecg, dtype=np.float32).squeeze()
+        return np.zeros(ecg.shape[0], dtype=np.float32)
 
     rr_intervals = np.diff(peaks) / float(fs)
     hr_values = 60.0 / np.maximum(rr_intervals, 1e-6)
-    hr_times = (peaks[:-1] + peaks[1:]) / 2.0 / float(fs)
-
-    times = np.arange(ecg.shape[0], dtype=np.float64) / float(fs)
+    # Sample-index coordinates: same interpolation as on seconds, without
+    # building a float64 time axis over the whole recording.
+    hr_pos = (peaks[:-1] + peaks[1:]) / 2.0
     hr_signal = np.interp(
-        times, hr_times, hr_values, left=hr_values[0], right=hr_values[-1]
+        np.arange(ecg.shape[0]),
+        hr_pos,
+        hr_values,
+        left=hr_values[0],
+        right=hr_values[-1],
     )
-    return hr_signal.astype(np.float32)
+    return np.ascontiguousarray(hr_signal, dtype=np.float32)
+
+
+def _window_counts(values: np.ndarray, starts: np.ndarray, window_len: int):
+    """
+    Sum of integer/boolean values over [start, start + window_len) for each
+    start, from one cumulative sum over the whole stream.
+    """
+    cumulative = np.zeros(values.size + 1, dtype=np.int64)
+    np.cumsum(values, out=cumulative[1:])
+    return cumulative[starts + window_len] - cumulative[starts]
 
 
 def window_features_with_labels(
@@ -98,33 +141,28 @@ def window_features_with_labels(
     step = int(window_len * (1 - overlap))
     if step <= 0:
         raise ValueError("Overlap too high; step must be > 0")
+    if len(eda) < window_len:
+        return np.empty((0, 21), dtype=np.float32), np.empty((0,), dtype=np.int64)
 
-    features_list = []
-    label_list = []
-
-    for start in range(0, len(eda) - window_len + 1, step):
-        end = start + window_len
-        eda_win = eda[start:end]
-        hr_win = hr[start:end]
-        label_win = labels[start:end]
-
-        valid = label_win[np.isin(label_win, list(VALID_LABELS))]
-        if valid.size == 0:
-            continue
-
-        counts = np.bincount(valid.astype(int))
-        majority_label = int(np.argmax(counts))
-        binary_label = 1 if majority_label == STRESS_LABEL else 0
-
-        features = extract_features(eda_win, hr_win)
-        features_list.append(features)
-        label_list.append(binary_label)
+    # (n_windows, window_len) views over the signals; no window is copied.
+    eda_w = sliding_window_view(eda, window_len)[::step]
+    hr_w = sliding_window_view(hr, window_len)[::step]
+    starts = np.arange(eda_w.shape[0]) * step
 
-    if not features_list:
+    # Per-window count of each valid label; argmax keeps the lowest label on
+    # ties, like np.bincount + np.argmax did.
+    valid = sorted(VALID_LABELS)
+    counts = np.column_stack(
+        [_window_counts(labels == value, starts, window_len) for value in valid]
+    )
+    keep = counts.sum(axis=1) > 0
+    if not keep.any():
         return np.empty((0, 21), dtype=np.float32), np.empty((0,), dtype=np.int64)
 
-    X = np.vstack(features_list)
-    y = np.asarray(label_list, dtype=np.int64)
+    majority = np.asarray(valid)[np.argmax(counts[keep], axis=1)]
+    y = (majority == STRESS_LABEL).astype(np.int64)
+
+    X = extract_features_batch(eda_w[keep], hr_w[keep])
     return X, y
 
 
@@ -141,30 +179,48 @@ def window_features_with_binary_labels(
     step = int(window_len * (1 - overlap))
     if step <= 0:
         raise ValueError("Overlap too high; step must be > 0")
+    if len(eda) < window_len:
+        return np.empty((0, 21), dtype=np.float32), np.empty((0,), dtype=np.int64)
 
-    features_list = []
-    label_list = []
+    eda_w = sliding_window_view(eda, window_len)[::step]
+    hr_w = sliding_window_view(hr, window_len)[::step]
+    starts = np.arange(eda_w.shape[0]) * step
 
-    for start in range(0, len(eda) - window_len + 1, step):
-        end = start + window_len
-        eda_win = eda[start:end]
-        hr_win = hr[start:end]
-        label_win = labels[start:end]
+    y = np.round(_window_counts(labels, starts, window_len) / window_len)
+    y = y.astype(np.int64)
+    X = extract_features_batch(eda_w, hr_w)
+    return X, y
 
-        if label_win.size == 0:
-            continue
 
-        majority_label = int(np.round(np.mean(label_win)))
-        features = extract_features(eda_win, hr_win)
-        features_list.append(features)
-        label_list.append(majority_label)
+def _process_subject(
+    args: tuple[str, int, int, float],
+) -> tuple[np.ndarray, np.ndarray] | None:
+    """
+    Load one WESAD subject pickle and build its windowed features.
+    args is (pkl_path, fs, window_s, overlap); returns None for subjects
+    with mismatched signal lengths or no labelled windows.
+    """
+    pkl_path, fs, window_s, overlap = args
+    with open(pkl_path, "rb") as handle:
+        data = pickle.load(handle, encoding="latin1")
 
-    if not features_list:
-        return np.empty((0, 21), dtype=np.float32), np.empty((0,), dtype=np.int64)
+    # Contiguous float32 from here on; window moments are still float64.
+    eda = np.ascontiguousarray(
+        data["signal"]["chest"]["EDA"].astype(np.float32).squeeze()
+    )
+    ecg = np.ascontiguousarray(
+        data["signal"]["chest"]["ECG"].astype(np.float32).squeeze()
+    )
+    labels = data["label"].astype(np.int64)
 
-    X = np.vstack(features_list)
-    y = np.asarray(label_list, dtype=np.int64)
-    return X, y
+    if eda.shape[0] != labels.shape[0] or ecg.shape[0] != labels.shape[0]:
+        return None
+
+    hr = ecg_to_hr(ecg, fs)
+    X_sub, y_sub = window_features_with_labels(eda, hr, labels, fs, window_s, overlap)
+    if X_sub.size == 0:
+        return None
+    return X_sub, y_sub
 
 
 def load_wesad_dataset(
@@ -172,42 +228,44 @@ def load_wesad_dataset(
     fs: int = 700,
     window_s: int = 25,
     overlap: float = 0.5,
+    max_workers: int | None = None,
 ) -> tuple[np.ndarray, np.ndarray, np.ndarray] | None:
     """
     Load WESAD chest EDA/ECG, compute HR, and build windowed features.
+    Subjects are processed in parallel worker processes (max_workers,
+    default: up to 8).
     """
     wesad_dir = os.path.join(datasets_dir, "WESAD")
     if not os.path.isdir(wesad_dir):
         return None
 
-    X_list = []
-    y_list = []
-    group_list = []
-
+    subject_dirs = []
     for subject_dir in sorted(os.listdir(wesad_dir)):
         if not subject_dir.startswith("S"):
             continue
         pkl_path = os.path.join(wesad_dir, subject_dir, f"{subject_dir}.pkl")
-        if not os.path.isfile(pkl_path):
-            continue
-
-        with open(pkl_path, "rb") as handle:
-            data = pickle.load(handle, encoding="latin1")
+        if os.path.isfile(pkl_path):
+            subject_dirs.append((subject_dir, pkl_path))
+    if not subject_dirs:
+        return None
 
-        eda = data["signal"]["chest"]["EDA"].astype(np.float32).squeeze()
-        ecg = data["signal"]["chest"]["ECG"].astype(np.float32).squeeze()
-        labels = data["label"].astype(np.int64)
+    workers = max_workers or min(8, len(subject_dirs))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = list(
+            pool.map(
+                _process_subject,
+                [(pkl_path, fs, window_s, overlap) for _, pkl_path in subject_dirs],
+            )
+        )
 
-        if eda.shape[0] != labels.shape[0] or ecg.shape[0] != labels.shape[0]:
-            continue
+    X_list = []
+    y_list = []
+    group_list = []
 
-        hr = ecg_to_hr(ecg, fs)
-        X_sub, y_sub = window_features_with_labels(
-            eda, hr, labels, fs, window_s, overlap
-        )
-        if X_sub.size == 0:
+    for (subject_dir, _), result in zip(subject_dirs, results):
+        if result is None:
             continue
-
+        X_sub, y_sub = result
         subject_id = (
             int(subject_dir[1:]) if subject_dir[1:].isdigit() else len(group_list)
         )
@@ -342,42 +400,100 @@ def load_swell_dataset(
     return X, y, groups, summary
 
 
-def extract_features(eda_signal: np.ndarray, hr_signal: np.ndarray) -> np.ndarray:
+def _batch_stats(windows: np.ndarray) -> np.ndarray:
     """
-    Extract the 21 features defined in the paper from EDA and HR signals.
-    Returns a 1D array of shape (21,).
+    Per-window statistics of a (n_windows, window_len) matrix.
+    Returns (n_windows, 9): mean, median, std, var, min, max, skew, kurtosis,
+    range. Skew and kurtosis use the bias-corrected estimators of pandas.
     """
+    n = windows.shape[1]
+    # Moments are accumulated in float64 even for float32 windows; float32
+    # rounding in the mean would swamp the higher moments of flat windows.
+    mean = windows.mean(axis=1, dtype=np.float64)
+    # Central moments from one set of deviations; var/std reuse m2.
+    dev = windows - mean[:, np.newaxis]
+    dev2 = dev * dev
+    m2 = dev2.mean(axis=1)
+    m3 = (dev2 * dev).mean(axis=1)
+    m4 = (dev2 * dev2).mean(axis=1)
+    min_v = windows.min(axis=1)
+    max_v = windows.max(axis=1)
+
+    skew = np.full(windows.shape[0], np.nan)
+    kurt = np.full(windows.shape[0], np.nan)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        if n > 2:
+            skew = np.sqrt(n * (n - 1)) / (n - 2) * m3 / m2**1.5
+        if n > 3:
+            g2 = m4 / (m2 * m2) - 3.0
+            kurt = ((n + 1) * g2 + 6.0) * (n - 1) / ((n - 2) * (n - 3))
+    # pandas reports 0 (not NaN) for constant windows. Their mean is rarely
+    # exact, so m2 carries rounding noise: test the range, and treat m2 under
+    # the float error bound as flat too, like pandas does.
+    max_abs = np.maximum(np.abs(min_v), np.abs(max_v))
+    flat = (max_v == min_v) | (m2 <= (np.finfo(m2.dtype).eps * max_abs) ** 2)
+    skew[flat & (n > 2)] = 0.0
+    kurt[flat & (n > 3)] = 0.0
+
+    return np.column_stack(
+        [
+            mean,
+            np.median(windows, axis=1),
+            np.sqrt(m2),
+            m2,
+            min_v,
+            max_v,
+            skew,
+            kurt,
+            max_v - min_v,
+        ]
+    )
 
-    def stats(x: np.ndarray) -> list:
-        mean = np.mean(x)
-        median = np.median(x)
-        std = np.std(x)
-        var = np.var(x)
-        min_v = np.min(x)
-        max_v = np.max(x)
-        skew = pd.Series(x).skew()
-        kurt = pd.Series(x).kurt()
-        dyn_range = max_v - min_v
-        return [mean, median, std, var, min_v, max_v, skew, kurt, dyn_range]
-
-    eda_feats = stats(eda_signal)
-    hr_feats = stats(hr_signal)
 
-    # Interaction feature
-    cov = np.cov(eda_signal, hr_signal)[0, 1]
+def extract_features_batch(
+    eda_windows: np.ndarray, hr_windows: np.ndarray
+) -> np.ndarray:
+    """
+    Extract the 21 paper features for every row of (n_windows, window_len)
+    EDA and HR matrices. Returns an array of shape (n_windows, 21).
+    """
+    # float32 windows are not copied; _batch_stats takes moments in float64.
+    eda_w = np.asarray(eda_windows, dtype=np.result_type(eda_windows, np.float32))
+    hr_w = np.asarray(hr_windows, dtype=np.result_type(hr_windows, np.float32))
+    eda_stats = _batch_stats(eda_w)
+    hr_stats = _batch_stats(hr_w)
+
+    # Interaction feature: sample covariance (ddof=1) per window
+    n = eda_w.shape[1]
+    if n > 1:
+        cov = np.einsum(
+            "ij,ij->i", eda_w - eda_stats[:, :1], hr_w - hr_stats[:, :1]
+        ) / (n - 1)
+    else:
+        cov = np.full(eda_w.shape[0], np.nan)
 
     # Physiological features
     # Skin resistance is inverse of EDA (avoid division by zero)
-    skin_resistance = np.mean(1.0 / (eda_signal + 1e-6))
+    skin_resistance = (1.0 / (eda_w + 1e-6)).mean(axis=1)
     # HRV approximation (std of HR)
-    hrv = np.std(hr_signal)
+    hrv = hr_stats[:, 2]
 
-    features = np.array(
-        eda_feats + hr_feats + [cov, skin_resistance, hrv], dtype=np.float32
+    features = np.column_stack([eda_stats, hr_stats, cov, skin_resistance, hrv]).astype(
+        np.float32
     )
     return np.nan_to_num(features, nan=0.0, posinf=0.0, neginf=0.0)
 
 
+def extract_features(eda_signal: np.ndarray, hr_signal: np.ndarray) -> np.ndarray:
+    """
+    Extract the 21 features defined in the paper from EDA and HR signals.
+    Returns a 1D array of shape (21,).
+    """
+    return extract_features_batch(
+        np.asarray(eda_signal)[np.newaxis], np.asarray(hr_signal)[np.newaxis]
+    )[0]
+
+
 def window_signals(
     eda: np.ndarray,
     hr: np.ndarray,
@@ -395,25 +511,42 @@ def window_signals(
     step = int(window_len * (1 - overlap))
     if step <= 0:
         raise ValueError("Overlap too high; step must be > 0")
+    if len(eda) < window_len:
+        return np.empty((0, 21), dtype=np.float32)
 
-    features_list = []
-    for start in range(0, len(eda) - window_len + 1, step):
-        eda_win = eda[start : start + window_len]
-        hr_win = hr[start : start + window_len]
-        features_list.append(extract_features(eda_win, hr_win))
-
-    return (
-        np.vstack(features_list)
-        if features_list
-        else np.empty((0, 21), dtype=np.float32)
+    return extract_features_batch(
+        sliding_window_view(eda, window_len)[::step],
+        sliding_window_view(hr, window_len)[::step],
     )
 
 
-def build_tabnet() -> TabNetClassifier:
+class AmpTabNetClassifier(TabNetClassifier):
+    """
+    TabNetClassifier whose training forward pass runs under bfloat16 autocast
+    on CUDA. The loss stays in float32 and prediction is unchanged.
+    """
+
+    def _train_batch(self, X, y):
+        if self.device.type != "cuda":
+            return super()._train_batch(X, y)
+        forward = self.network.forward
+        self.network.forward = torch.autocast("cuda", dtype=torch.bfloat16)(forward)
+        try:
+            return super()._train_batch(X, y)
+        finally:
+            del self.network.forward
+
+    def compute_loss(self, y_pred, y_true):
+        return super().compute_loss(y_pred.float(), y_true)
+
+
+def build_tabnet(amp: bool = False) -> TabNetClassifier:
     """
     Initialize TabNetClassifier with the exact hyperparameters from the paper.
+    Trains on CUDA when available; amp adds bfloat16 autocast there.
     """
-    return TabNetClassifier(
+    model_cls = AmpTabNetClassifier if amp else TabNetClassifier
+    return model_cls(
         n_d=41,
         n_a=41,
         n_steps=4,
@@ -423,6 +556,7 @@ def build_tabnet() -> TabNetClassifier:
         optimizer_params=dict(lr=0.0088),
         mask_type="sparsemax",
         scheduler_params=dict(step_size=10, gamma=0.9),
+        device_name="cuda" if torch.cuda.is_available() else "cpu",
     )
 
 
@@ -463,6 +597,136 @@ def generate_explanations(
     print(explanation.as_list())
 
 
+def group_moments(X: np.ndarray, groups: np.ndarray) -> dict:
+    """
+    Per-group column count, mean and centered sum of squares (M2), in
+    float64. LOSO folds merge these into their training mean/std.
+    """
+    order = np.argsort(groups, kind="stable")
+    group_ids, starts, counts = np.unique(
+        groups[order], return_index=True, return_counts=True
+    )
+    X_sorted = np.asarray(X, dtype=np.float64)[order]
+    group_mean = np.add.reduceat(X_sorted, starts, axis=0) / counts[:, np.newaxis]
+    dev = X_sorted - np.repeat(group_mean, counts, axis=0)
+    group_m2 = np.add.reduceat(dev * dev, starts, axis=0)
+    return {
+        "groups": {
+            g: (int(n), mean, m2)
+            for g, n, mean, m2 in zip(group_ids, counts, group_mean, group_m2)
+        },
+    }
+
+
+def _merge_moments(a: tuple, b: tuple) -> tuple:
+    """
+    Combine two (n, mean, M2) column moments (Chan et al. pairwise update).
+    Centered M2 avoids the cancellation of sum_sq / n - mean**2.
+    """
+    n_a, mean_a, m2_a = a
+    n_b, mean_b, m2_b = b
+    n = n_a + n_b
+    delta = mean_b - mean_a
+    return n, mean_a + delta * (n_b / n), m2_a + m2_b + delta * delta * (n_a * n_b / n)
+
+
+def standardize_fold(
+    moments: dict, held_out: int, X_val: np.ndarray, *arrays: np.ndarray
+) -> None:
+    """
+    Standardize arrays in place with the mean/std of the fold's training
+    split: everything except the held-out group and the validation rows.
+    Matches StandardScaler fit on that split (constant columns scale by 1).
+    """
+    train = None
+    for g, group in moments["groups"].items():
+        if g != held_out:
+            train = group if train is None else _merge_moments(train, group)
+    n_t, mean_t, m2_t = train
+
+    # Take the validation rows back out of the merged training moments.
+    X_val64 = np.asarray(X_val, dtype=np.float64)
+    n_v = X_val64.shape[0]
+    mean_v = X_val64.mean(axis=0)
+    dev_v = X_val64 - mean_v
+    n = n_t - n_v
+    mean = mean_t + (mean_t - mean_v) * (n_v / n)
+    delta = mean_v - mean
+    m2 = m2_t - np.einsum("ij,ij->j", dev_v, dev_v) - delta * delta * (n * n_v / n_t)
+    var = np.maximum(m2 / n, 0.0)
+
+    # StandardScaler's constant-feature test: variance within float error of 0.
+    eps = np.finfo(np.float64).eps
+    constant = var <= n * eps * var + (n * mean * eps) ** 2
+    scale = np.where(constant, 1.0, np.sqrt(var))
+    for array in (X_val, *arrays):
+        np.subtract(array, mean, out=array, casting="same_kind")
+        np.divide(array, scale, out=array, casting="same_kind")
+
+
+def run_fold(
+    fold: int,
+    train_idx: np.ndarray,
+    test_idx: np.ndarray,
+    X: np.ndarray,
+    y: np.ndarray,
+    groups: np.ndarray,
+    moments: dict,
+    keep_model: bool = False,
+    amp: bool = False,
+) -> dict:
+    """
+    Scale, train and evaluate one LOSO fold (moments from group_moments).
+    Returns a dict with the fold's subject and metrics; the model and scaled
+    train/test data are included only when keep_model is set (for XAI).
+    """
+    subject_id = groups[test_idx][0]
+    X_train, X_test = X[train_idx], X[test_idx]
+    y_train, y_test = y[train_idx], y[test_idx]
+
+    if len(np.unique(y_train)) < 2 or len(np.unique(y_test)) < 2:
+        return {"fold": fold, "subject_id": subject_id, "skipped": True}
+
+    X_train_full, X_val, y_train_full, y_val = train_test_split(
+        X_train,
+        y_train,
+        test_size=0.1,
+        stratify=y_train,
+        random_state=42,
+    )
+
+    # Scale with the training split's statistics (fit on train, apply to
+    # val/test), derived from the precomputed sums in O(held-out + val) rows.
+    standardize_fold(moments, subject_id, X_val, X_train_full, X_test)
+
+    model = build_tabnet(amp=amp)
+    model.fit(
+        X_train_full,
+        y_train_full,
+        eval_set=[(X_val, y_val)],
+        eval_metric=["accuracy"],
+        max_epochs=100,
+        patience=10,
+        batch_size=4096,
+        virtual_batch_size=128,
+        num_workers=0,
+        drop_last=False,
+    )
+
+    y_pred = model.predict(X_test)
+    return {
+        "fold": fold,
+        "subject_id": subject_id,
+        "skipped": False,
+        "accuracy": accuracy_score(y_test, y_pred),
+        "f1": f1_score(y_test, y_pred, zero_division=0),
+        "model": model if keep_model else None,
+        "X_train": X_train_full if keep_model else None,
+        "X_test": X_test if keep_model else None,
+        "y_test": y_test if keep_model else None,
+    }
+
+
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(
         description="TabNet stress detection (WESAD/Mock)."
@@ -501,6 +765,23 @@ def parse_args() -> argparse.Namespace:
         default=0.5,
         help="Window overlap fraction (default: 0.5).",
     )
+    parser.add_argument(
+        "--load-workers",
+        type=int,
+        default=None,
+        help="Processes used to load WESAD subjects (default: up to 8).",
+    )
+    parser.add_argument(
+        "--n-jobs",
+        type=int,
+        default=1,
+        help="LOSO folds to train in parallel (-1 = all cores; default: 1).",
+    )
+    parser.add_argument(
+        "--amp",
+        action="store_true",
+        help="Train with bfloat16 autocast when running on CUDA.",
+    )
     parser.add_argument(
         "--no-train-final", action="store_true", help="Skip training a final model."
     )
@@ -528,6 +809,7 @@ def main() -> None:
                 fs=args.fs,
                 window_s=args.window_s,
                 overlap=args.overlap,
+                max_workers=args.load_workers,
             )
             if wesad_data is not None:
                 X_wesad, y_wesad, g_wesad, summary = wesad_data
@@ -584,60 +866,46 @@ def main() -> None:
             )
 
     logo = LeaveOneGroupOut()
+    moments = group_moments(X, groups)
+    explain = not args.skip_xai
 
     print("Starting LOSO cross-validation...")
-    for fold, (train_idx, test_idx) in enumerate(
-        logo.split(X, y, groups=groups), start=1
-    ):
-        X_train, X_test = X[train_idx], X[test_idx]
-        y_train, y_test = y[train_idx], y[test_idx]
+    # Folds are independent; with --n-jobs > 1 each runs in a loky worker
+    # (joblib memory-maps X/y for the workers instead of pickling copies).
+    results = Parallel(n_jobs=args.n_jobs, backend="loky")(
+        delayed(run_fold)(
+            fold,
+            train_idx,
+            test_idx,
+            X,
+            y,
+            groups,
+            moments,
+            keep_model=explain and fold == 1,
+            amp=args.amp,
+        )
+        for fold, (train_idx, test_idx) in enumerate(
+            logo.split(X, y, groups=groups), start=1
+        )
+    )
 
-        if len(np.unique(y_train)) < 2 or len(np.unique(y_test)) < 2:
+    for result in results:
+        if result["skipped"]:
             print(
-                f"Subject {groups[test_idx][0]} | Fold {fold} skipped (single-class fold)."
+                f"Subject {result['subject_id']} | Fold {result['fold']} "
+                "skipped (single-class fold)."
             )
             continue
-
-        X_train_full, X_val, y_train_full, y_val = train_test_split(
-            X_train,
-            y_train,
-            test_size=0.1,
-            stratify=y_train,
-            random_state=42,
-        )
-
-        # StandardScaler inside the loop (fit on train, transform on val/test)
-        scaler = StandardScaler()
-        X_train_full = scaler.fit_transform(X_train_full)
-        X_val = scaler.transform(X_val)
-        X_test = scaler.transform(X_test)
-
-        model = build_tabnet()
-        model.fit(
-            X_train_full,
-            y_train_full,
-            eval_set=[(X_val, y_val)],
-            eval_metric=["accuracy"],
-            max_epochs=100,
-            patience=10,
-            batch_size=4096,
-            virtual_batch_size=128,
-            num_workers=0,
-            drop_last=False,
-        )
-
-        y_pred = model.predict(X_test)
-        acc = accuracy_score(y_test, y_pred)
-        f1 = f1_score(y_test, y_pred, zero_division=0)
-
-        subject_id = groups[test_idx][0]
         print(
-            f"Subject {subject_id} | Fold {fold} | Accuracy: {acc:.4f} | F1: {f1:.4f}"
+            f"Subject {result['subject_id']} | Fold {result['fold']} | "
+            f"Accuracy: {result['accuracy']:.4f} | F1: {result['f1']:.4f}"
         )
 
         # Generate explanations only for the first fold to keep runtime reasonable
-        if fold == 1 and not args.skip_xai:
-            generate_explanations(model, X_train_full, X_test, y_test)
+        if result["model"] is not None:
+            generate_explanations(
+                result["model"], result["X_train"], result["X_test"], result["y_test"]
+            )
 
     print("LOSO evaluation complete.")
 
@@ -654,7 +922,7 @@ def main() -> None:
         X_train_full = scaler.fit_transform(X_train_full)
         X_val = scaler.transform(X_val)
 
-        final_model = build_tabnet()
+        final_model = build_tabnet(amp=args.amp)
         final_model.fit(
             X_train_full,
             y_train_full,
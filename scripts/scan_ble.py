@@ -1,17 +1,87 @@
+import argparse
 import asyncio
+import sys
+from collections import deque
+from pathlib import Path
+
 from bleak import BleakScanner
 
+# Add src/ directory to sys.path to run locally during development
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(PROJECT_ROOT / "src"))
+
+from polar_ble_sdk.connector.event_loop import use_uvloop
+
+PRINT_INTERVAL = 0.1  # seconds
+
+
+async def find_by_name(name: str, timeout: float) -> None:
+    needle = name.lower()
+
+    def _match(device, advertisement_data) -> bool:
+        found = device.name or advertisement_data.local_name or ""
+        return needle in found.lower() or needle == device.address.lower()
+
+    print(f"Scanning up to {timeout:.0f} seconds for a device matching '{name}'...")
+    # Returns as soon as the first matching advertisement arrives.
+    device = await BleakScanner.find_device_by_filter(_match, timeout=timeout)
+    if device is None:
+        print("No matching device found.")
+        return
+    print(f"Found: {device.name or 'Unknown/Desconhecido'} [{device.address}]")
+
 
 async def main():
-    print("Scanning for BLE devices for 10 seconds...")
-    devices = await BleakScanner.discover(timeout=10.0)
+    parser = argparse.ArgumentParser(description="Scan for nearby BLE devices")
+    parser.add_argument(
+        "--name",
+        default=None,
+        help="Stop at the first device whose name (or address) matches",
+    )
+    parser.add_argument("--timeout", type=float, default=10.0)
+    args = parser.parse_args()
+
+    if args.name:
+        await find_by_name(args.name, args.timeout)
+        return
+
+    print(f"Scanning for BLE devices for {args.timeout:.0f} seconds...")
     print("\nDiscovered Devices:")
     print("=" * 60)
-    for idx, d in enumerate(devices):
-        name = d.name if d.name else "Unknown/Desconhecido"
-        print(f"{idx + 1}. {name} [{d.address}]")
+    seen: set[str] = set()
+    pending: deque[str] = deque()
+
+    # List each device as its first advertisement arrives instead of
+    # buffering the whole scan window with BleakScanner.discover(). The
+    # detection callback only queues the line; _print_loop writes it.
+    def _on_detect(device, advertisement_data) -> None:
+        if device.address in seen:
+            return
+        seen.add(device.address)
+        name = device.name or advertisement_data.local_name or "Unknown/Desconhecido"
+        pending.append(f"{len(seen)}. {name} [{device.address}]\n")
+
+    def _drain() -> None:
+        if pending:
+            lines = [pending.popleft() for _ in range(len(pending))]
+            sys.stdout.write("".join(lines))
+            sys.stdout.flush()
+
+    async def _print_loop() -> None:
+        while True:
+            await asyncio.sleep(PRINT_INTERVAL)
+            _drain()
+
+    printer = asyncio.create_task(_print_loop())
+    try:
+        async with BleakScanner(_on_detect):
+            await asyncio.sleep(args.timeout)
+    finally:
+        printer.cancel()
+        _drain()
     print("=" * 60)
 
 
 if __name__ == "__main__":
+    use_uvloop()
     asyncio.run(main())
@@ -2,14 +2,28 @@
 
 from __future__ import annotations
 
+import importlib
+from typing import TYPE_CHECKING, Any
+
 from polar_ble_sdk.connector.ble_discovery import (
     discover_dual_polar_devices,
     discover_polar_device,
 )
 from polar_ble_sdk.connector.schemas import SignalPacket
 from polar_ble_sdk.connector.stream import create_polar_connector
-from polar_ble_sdk.reader import StressPredictor, load_model_bundle
-from polar_ble_sdk.reader.realtime import ReaderConfig, run_reader
+
+if TYPE_CHECKING:
+    from polar_ble_sdk.reader import StressPredictor, load_model_bundle
+    from polar_ble_sdk.reader.realtime import ReaderConfig, run_reader
+
+# The reader stack pulls in joblib and the ML model code; import it on first
+# use so streaming-only entry points (CLI, scripts) start faster.
+_LAZY_EXPORTS = {
+    "StressPredictor": "polar_ble_sdk.reader",
+    "load_model_bundle": "polar_ble_sdk.reader",
+    "ReaderConfig": "polar_ble_sdk.reader.realtime",
+    "run_reader": "polar_ble_sdk.reader.realtime",
+}
 
 __all__ = [
     "discover_polar_device",
@@ -21,3 +35,12 @@ __all__ = [
     "run_reader",
     "SignalPacket",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
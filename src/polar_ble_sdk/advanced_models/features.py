@@ -38,39 +38,46 @@ def generate_feature_matrix(
         return pd.DataFrame()
 
     start_time = df[time_col].iloc[0]
-    end_time = df[time_col].iloc[-1]
     step = pd.to_timedelta(spec.step_seconds, unit="s")
     window = pd.to_timedelta(spec.window_seconds, unit="s")
-
+    if step <= pd.Timedelta(0):
+        raise ValueError("Overlap too high; step must be > 0")
+
+    # Window bounds come from binary searches on the sorted timestamps (ns)
+    # rather than a boolean mask over the whole frame per window.
+    timestamps = df[time_col].dt.as_unit("ns").astype("int64").to_numpy()
+    span = int(timestamps[-1] - timestamps[0])
+    n_windows = (span - window.value) // step.value + 1 if span >= window.value else 0
+    starts = timestamps[0] + np.arange(n_windows, dtype=np.int64) * step.value
+    lo = np.searchsorted(timestamps, starts, side="left")
+    hi = np.searchsorted(timestamps, starts + window.value, side="left")
+
+    eda = df[eda_col].to_numpy(dtype=float)
+    hr = df[hr_col].to_numpy(dtype=float)
     rows: list[dict[str, float]] = []
-    current = start_time
-    while current + window <= end_time:
-        window_df = df[(df[time_col] >= current) & (df[time_col] < current + window)]
-        if not window_df.empty:
-            rows.append(
-                _compute_window_features(
-                    window_df,
-                    eda_col=eda_col,
-                    hr_col=hr_col,
-                    window_start=current,
-                    window_end=current + window,
-                )
+    for index in np.flatnonzero(hi > lo):
+        current = start_time + int(index) * step
+        rows.append(
+            _compute_window_features(
+                eda[lo[index] : hi[index]],
+                hr[lo[index] : hi[index]],
+                window_start=current,
+                window_end=current + window,
             )
-        current += step
+        )
 
     return pd.DataFrame(rows)
 
 
 def _compute_window_features(
-    window_df: pd.DataFrame,
-    eda_col: str,
-    hr_col: str,
+    eda: np.ndarray,
+    hr: np.ndarray,
     window_start: pd.Timestamp,
     window_end: pd.Timestamp,
 ) -> dict[str, float]:
-    eda_stats = _basic_stats(window_df[eda_col])
-    hr_stats = _basic_stats(window_df[hr_col])
-    covariance = float(np.cov(window_df[eda_col], window_df[hr_col])[0, 1])
+    eda_stats = _basic_stats(eda)
+    hr_stats = _basic_stats(hr)
+    covariance = _covariance(eda, hr)
 
     features: dict[str, float] = {
         "window_start": window_start.timestamp(),
@@ -84,16 +91,29 @@ def _compute_window_features(
     return features
 
 
+def _covariance(x: np.ndarray, y: np.ndarray) -> float:
+    """Sample covariance (ddof=1) as a single centered dot product."""
+    if x.size < 2:
+        return float("nan")
+    x_centered = x - x.mean()
+    y_centered = y - y.mean()
+    return float(np.dot(x_centered, y_centered) / (x.size - 1))
+
+
 def _basic_stats(series: Iterable[float]) -> dict[str, float]:
     values = pd.Series(series).astype(float)
+    # Each reduction is a full pass: derive std from var and range from min/max.
+    var = float(values.var(ddof=0))
+    min_v = float(values.min())
+    max_v = float(values.max())
     return {
         "mean": float(values.mean()),
         "median": float(values.median()),
-        "std": float(values.std(ddof=0)),
-        "var": float(values.var(ddof=0)),
-        "min": float(values.min()),
-        "max": float(values.max()),
+        "std": float(np.sqrt(var)),
+        "var": var,
+        "min": min_v,
+        "max": max_v,
         "skew": float(values.skew()),
         "kurtosis": float(values.kurtosis()),
-        "range": float(values.max() - values.min()),
+        "range": max_v - min_v,
     }
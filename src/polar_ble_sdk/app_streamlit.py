@@ -13,6 +13,7 @@ import os
 import queue
 import time
 from collections import deque
+from operator import itemgetter
 import threading
 import warnings
 
@@ -47,6 +48,10 @@ MODEL_PATH = PROJECT_ROOT / "models" / "improved_stress_model.pkl"
 SCALER_PATH = PROJECT_ROOT / "models" / "scaler.pkl"
 PREDICTION_INTERVAL = 15  # seconds
 LLM_MODEL = "gpt-4o-mini"
+# Staged BLE messages kept while the UI is not draining (oldest dropped first).
+BLE_QUEUE_MAXLEN = 4096
+# First PPG channel of a (ch0, ch1, ch2, ambient) sample.
+_FIRST = itemgetter(0)
 
 LLM_TREND_PROMPT = """Please analyse trends in stress.
 Right now I am presenting in big meeting. Here is data
@@ -74,9 +79,10 @@ llm_enabled = bool(OPENAI_API_KEY)
 client = OpenAI(api_key=OPENAI_API_KEY) if llm_enabled else None
 warnings.filterwarnings("ignore")
 
-# Define global queue for background thread communication
+# Define global queue for background thread communication. deque append/popleft
+# are atomic, so BLE callbacks stage messages without taking a Queue lock.
 if "GLOBAL_BLE_QUEUE" not in st.session_state:
-    st.session_state.GLOBAL_BLE_QUEUE = queue.Queue()
+    st.session_state.GLOBAL_BLE_QUEUE = deque(maxlen=BLE_QUEUE_MAXLEN)
 
 
 def check_password() -> bool:
@@ -126,20 +132,47 @@ def calculate_rmssd(rr_intervals: list) -> float | None:
     if len(rr_intervals) < 2:
         return None
     try:
-        rr_array = np.array(
-            [float(rr) for rr in rr_intervals if rr is not None and rr > 0]
-        )
-        if len(rr_array) < 2:
+        rr_array = np.array(rr_intervals, dtype=float)
+        rr_array = rr_array[rr_array > 0]
+        if rr_array.size < 2:
             return None
-        return float(np.sqrt(np.mean(np.diff(rr_array) ** 2)))
-    except Exception:
+        diffs = np.diff(rr_array)
+        return float(np.sqrt(np.dot(diffs, diffs) / diffs.size))
+    except (TypeError, ValueError):
         return None
 
 
+# ==========================================
+# Mock waveforms
+# ==========================================
+def _mock_ecg_beat() -> np.ndarray:
+    """One 130-sample synthetic ECG beat (P, QRS and T waves)."""
+    beat = np.zeros(130)
+    t = np.arange(10)
+    beat[:10] = 100 * np.sin(np.pi * t / 10)  # P-wave
+    beat[16] = -150  # Q-wave
+    beat[17] = 1200  # R-wave spike
+    beat[18] = 800
+    beat[19] = -300  # S-wave
+    t = np.arange(25, 40)
+    beat[25:40] = 250 * np.sin(np.pi * (t - 25) / 15)  # T-wave
+    return beat
+
+
+# Precomputed once; the mock generator only indexes these per tick.
+_MOCK_ECG_BEAT = _mock_ecg_beat()
+_MOCK_PPG_PULSE = (
+    50000
+    + 4000 * np.sin(2 * np.pi * np.arange(60) / 60)
+    + 1500 * np.sin(4 * np.pi * np.arange(60) / 60)
+)
+_MOCK_PPG_CHANNEL_GAINS = np.array([1.0, 0.9, 0.85, 0.8])
+
+
 # ==========================================
 # Background BLE Task
 # ==========================================
-def ble_background_task(data_queue: queue.Queue, is_mock: bool):
+def ble_background_task(data_queue: deque, is_mock: bool):
     """Background thread to handle BLE connectivity or Mock data."""
     if is_mock:
         mock_hr = 70.0
@@ -154,58 +187,28 @@ def ble_background_task(data_queue: queue.Queue, is_mock: bool):
             if np.random.random() < 0.1:
                 mock_hr = float(np.clip(mock_hr + np.random.randint(-2, 3), 60, 100))
                 mock_hrv = float(np.clip(mock_hrv + np.random.randint(-3, 4), 30, 60))
-                data_queue.put(("data", (mock_hr, [mock_hrv])))
+                data_queue.append(("data", (mock_hr, [mock_hrv])))
 
             # Generate ECG (13 samples at 10Hz = 130Hz)
-            mock_ecg = []
-            for _ in range(13):
-                t = ecg_phase % 130
-                if t < 10:  # P-wave
-                    val = 100 * np.sin(np.pi * t / 10)
-                elif t < 15:  # Flat
-                    val = 0
-                elif t == 16:  # Q-wave
-                    val = -150
-                elif t == 17 or t == 18:  # R-wave spike
-                    val = 1200 if t == 17 else 800
-                elif t == 19:  # S-wave
-                    val = -300
-                elif t < 25:  # Flat
-                    val = 0
-                elif t < 40:  # T-wave
-                    val = 250 * np.sin(np.pi * (t - 25) / 15)
-                else:
-                    val = 0
-                val += np.random.randint(-15, 16)  # Add noise
-                mock_ecg.append(int(val))
-                ecg_phase += 1
-            data_queue.put(("ecg", mock_ecg))
+            idx = (ecg_phase + np.arange(13)) % 130
+            ecg_vals = _MOCK_ECG_BEAT[idx] + np.random.randint(-15, 16, size=13)
+            data_queue.append(("ecg", ecg_vals.astype(int).tolist()))
+            ecg_phase += 13
 
             # Generate PPG (6 samples at 10Hz = 60Hz)
-            mock_ppg = []
-            for _ in range(6):
-                t = ppg_phase % 60
-                val = (
-                    50000
-                    + 4000 * np.sin(2 * np.pi * t / 60)
-                    + 1500 * np.sin(4 * np.pi * t / 60)
-                )
-                val += np.random.randint(-100, 101)
-                mock_ppg.append(
-                    [int(val), int(val * 0.9), int(val * 0.85), int(val * 0.8)]
-                )
-                ppg_phase += 1
-            data_queue.put(("ppg", mock_ppg))
+            idx = (ppg_phase + np.arange(6)) % 60
+            ppg_vals = _MOCK_PPG_PULSE[idx] + np.random.randint(-100, 101, size=6)
+            mock_ppg = np.multiply.outer(ppg_vals, _MOCK_PPG_CHANNEL_GAINS)
+            data_queue.append(("ppg", mock_ppg.astype(int).tolist()))
+            ppg_phase += 6
 
             # Generate ACC (2 samples at 10Hz = 20Hz)
-            mock_acc = []
-            for _ in range(2):
-                x = int(100 * np.sin(acc_time) + np.random.randint(-5, 6))
-                y = int(50 * np.cos(acc_time) + np.random.randint(-5, 6))
-                z = int(980 + 20 * np.sin(acc_time * 2) + np.random.randint(-5, 6))
-                mock_acc.append((x, y, z))
-                acc_time += 0.05
-            data_queue.put(("acc", mock_acc))
+            t = acc_time + 0.05 * np.arange(2)
+            acc = np.column_stack(
+                (100 * np.sin(t), 50 * np.cos(t), 980 + 20 * np.sin(t * 2))
+            ) + np.random.randint(-5, 6, size=(2, 3))
+            data_queue.append(("acc", list(map(tuple, acc.astype(int).tolist()))))
+            acc_time += 0.1
     else:
 
         async def run_ble():
@@ -214,47 +217,42 @@ def ble_background_task(data_queue: queue.Queue, is_mock: bool):
                 device = await discover_polar_device(timeout=20.0)
 
                 if not device:
-                    data_queue.put(("error", "Polar device not found"))
+                    data_queue.append(("error", "Polar device not found"))
                     return
 
+                # Bound once here rather than looked up on every packet.
+                append = data_queue.append
+
                 def _callback(data):
                     if isinstance(data, tuple) and len(data) >= 2:
                         hr_val, rr_ints = data
-                        data_queue.put(("data", (hr_val, rr_ints if rr_ints else None)))
-
-                def _ecg_callback(data):
-                    data_queue.put(("ecg", data[1]))
-
-                def _ppg_callback(data):
-                    data_queue.put(("ppg", data[1]))
-
-                def _acc_callback(data):
-                    data_queue.put(("acc", data[1]))
+                        append(("data", (hr_val, rr_ints if rr_ints else None)))
 
                 def _ppi_callback(data):
-                    data_queue.put(("data", (None, data[1])))
+                    append(("data", (None, data[1])))
 
-                def _gyro_callback(data):
-                    data_queue.put(("gyro", data[1]))
+                def _forward(kind):
+                    def _sample_callback(data):
+                        append((kind, data[1]))
 
-                def _mag_callback(data):
-                    data_queue.put(("mag", data[1]))
+                    return _sample_callback
 
                 connector = create_polar_connector(
                     device,
                     callback=_callback,
-                    ecg_callback=_ecg_callback,
-                    ppg_callback=_ppg_callback,
-                    acc_callback=_acc_callback,
+                    ecg_callback=_forward("ecg"),
+                    ppg_callback=_forward("ppg"),
+                    acc_callback=_forward("acc"),
                     ppi_callback=_ppi_callback,
-                    gyro_callback=_gyro_callback,
-                    mag_callback=_mag_callback,
+                    gyro_callback=_forward("gyro"),
+                    mag_callback=_forward("mag"),
                 )
                 await connector.start_notify()
-                while True:
-                    await asyncio.sleep(1)
+                # Streaming runs from notification callbacks; park this
+                # coroutine until the thread exits instead of waking every second.
+                await asyncio.Event().wait()
             except Exception as e:
-                data_queue.put(("error", str(e)))
+                data_queue.append(("error", str(e)))
             finally:
                 if connector:
                     await connector.stop_notify()
@@ -280,19 +278,27 @@ def start_ble_thread_once(is_mock: bool):
 def process_queue_data(predictor):
     """Process incoming data from the BLE queue."""
     current_time = time.time()
-    queue_sink = QueueSink(queue.Queue())  # Temporary sink for realtime reader
+    # Session-wide sink; run_reader(stop_on_empty=True) leaves its queue empty.
+    queue_sink = st.session_state.prediction_sink
 
-    while not st.session_state.GLOBAL_BLE_QUEUE.empty():
-        msg_type, payload = st.session_state.GLOBAL_BLE_QUEUE.get_nowait()
+    def on_prediction(prediction):
+        st.session_state.stress_result = prediction.label.upper()
+        st.session_state.confidence = prediction.confidence
+        st.session_state.stress_auto = st.session_state.stress_result
+
+    # HR rows are buffered and appended to the DataFrame once per call; a
+    # pd.concat per sample copies the whole frame every time.
+    new_rows: list[tuple] = []
+
+    ble_queue = st.session_state.GLOBAL_BLE_QUEUE
+    while ble_queue:
+        msg_type, payload = ble_queue.popleft()
 
         if msg_type == "data":
             hr, hrv = payload
             if hr is not None:
                 st.session_state.hr_list.append(hr)
-                new_data = pd.DataFrame([[hr, hrv]], columns=["hr", "hrv"])
-                st.session_state.df = pd.concat(
-                    [st.session_state.df, new_data], ignore_index=True
-                )
+                new_rows.append((hr, hrv))
 
             if hrv is not None:
                 if isinstance(hrv, list):
@@ -320,14 +326,6 @@ def process_queue_data(predictor):
                             features={"rmssd": rmssd},
                         )
                         queue_sink.send(packet)
-
-                        def on_prediction(prediction):
-                            st.session_state.stress_result = prediction.label.upper()
-                            st.session_state.confidence = prediction.confidence
-                            st.session_state.stress_auto = (
-                                st.session_state.stress_result
-                            )
-
                         run_reader(
                             predictor,
                             queue_sink._queue,
@@ -366,15 +364,17 @@ def process_queue_data(predictor):
 
                     st.session_state.last_prediction_time = current_time
 
-            # Cleanup memory
+            # Cleanup memory (trim in place instead of rebinding a sliced copy)
             if len(st.session_state.hr_list) > 50:
-                st.session_state.hr_list = st.session_state.hr_list[-30:]
+                del st.session_state.hr_list[:-30]
             if len(st.session_state.hrv_list) > 100:
-                st.session_state.hrv_list = st.session_state.hrv_list[-50:]
+                del st.session_state.hrv_list[:-50]
         elif msg_type == "ecg":
             st.session_state.ecg_deque.extend(payload)
         elif msg_type == "ppg":
-            st.session_state.ppg_deque.extend([s[0] for s in payload])
+            # First channel only, fed straight into the deque without an
+            # intermediate list per packet.
+            st.session_state.ppg_deque.extend(map(_FIRST, payload))
         elif msg_type == "acc":
             st.session_state.acc_deque.extend(payload)
         elif msg_type == "gyro":
@@ -382,6 +382,27 @@ def process_queue_data(predictor):
         elif msg_type == "mag":
             st.session_state.mag_deque.extend(payload)
 
+    if new_rows:
+        st.session_state.df = pd.concat(
+            [st.session_state.df, pd.DataFrame(new_rows, columns=["hr", "hrv"])],
+            ignore_index=True,
+        )
+
+
+def split_xyz(samples) -> tuple[list, list, list]:
+    """Split tri-axial samples (objects with x/y/z or 3-sequences) into axes."""
+    x_vals, y_vals, z_vals = [], [], []
+    for sample in samples:
+        if hasattr(sample, "x"):
+            x_vals.append(sample.x)
+            y_vals.append(sample.y)
+            z_vals.append(sample.z)
+        elif isinstance(sample, (list, tuple)) and len(sample) >= 3:
+            x_vals.append(sample[0])
+            y_vals.append(sample[1])
+            z_vals.append(sample[2])
+    return x_vals, y_vals, z_vals
+
 
 # ==========================================
 # UI Components
@@ -554,25 +575,14 @@ def render_metrics_and_charts(predictor):
 
     with tab4:
         st.subheader("Inertial Measurement Unit (IMU) Data")
-        acc_data = list(st.session_state.acc_deque)
-        gyro_data = list(st.session_state.gyro_deque)
-        mag_data = list(st.session_state.mag_deque)
-
-        def parse_imu_deque(dq):
-            x_vals, y_vals, z_vals = [], [], []
-            for sample in dq:
-                if hasattr(sample, "x"):
-                    x_vals.append(sample.x)
-                    y_vals.append(sample.y)
-                    z_vals.append(sample.z)
-                elif isinstance(sample, (list, tuple)) and len(sample) >= 3:
-                    x_vals.append(sample[0])
-                    y_vals.append(sample[1])
-                    z_vals.append(sample[2])
-            return x_vals, y_vals, z_vals
+        # Axes are split straight from the deques; a list() copy first
+        # would walk every buffered sample twice per refresh.
+        acc_data = st.session_state.acc_deque
+        gyro_data = st.session_state.gyro_deque
+        mag_data = st.session_state.mag_deque
 
         if len(acc_data) > 0:
-            ax, ay, az = parse_imu_deque(acc_data)
+            ax, ay, az = split_xyz(acc_data)
             fig_acc = go.Figure()
             fig_acc.add_trace(
                 go.Scatter(y=ax, mode="lines", name="X", line=dict(color="#FF4B4B"))
@@ -595,7 +605,7 @@ def render_metrics_and_charts(predictor):
             st.info("Accelerometer stream inactive or waiting for data.")
 
         if len(gyro_data) > 0:
-            gx, gy, gz = parse_imu_deque(gyro_data)
+            gx, gy, gz = split_xyz(gyro_data)
             fig_gyro = go.Figure()
             fig_gyro.add_trace(
                 go.Scatter(
@@ -624,7 +634,7 @@ def render_metrics_and_charts(predictor):
             st.info("Gyroscope stream inactive or waiting for data.")
 
         if len(mag_data) > 0:
-            mx, my, mz = parse_imu_deque(mag_data)
+            mx, my, mz = split_xyz(mag_data)
             fig_mag = go.Figure()
             fig_mag.add_trace(
                 go.Scatter(y=mx, mode="lines", name="X", line=dict(color="#FF4B4B"))
@@ -714,6 +724,7 @@ def register_session_state():
                 "acc_deque": deque(maxlen=200),
                 "gyro_deque": deque(maxlen=200),
                 "mag_deque": deque(maxlen=200),
+                "prediction_sink": QueueSink(queue.Queue()),
             }
         )
 
@@ -6,6 +6,7 @@ import csv
 import sys
 import time
 from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any
 
@@ -15,13 +16,22 @@ from rich.panel import Panel
 from rich.table import Table
 from rich.text import Text
 
-from polar_ble_sdk.connector.ble_discovery import discover_polar_device
-from polar_ble_sdk.connector.stream import create_polar_connector
+from polar_ble_sdk.connector.ble_discovery import (
+    POLAR_ADVERTISED_SERVICES,
+    discover_polar_device,
+)
+from polar_ble_sdk.connector.stream import (
+    POLAR_GATT_SERVICES,
+    create_polar_connector,
+)
 from polar_ble_sdk.dashboard_utils import (
     BATTERY_SERVICE_UUID,
     CsvLogger,
-    calculate_rmssd,
     draw_sparkline,
+    format_last_sample,
+    format_timestamp,
+    make_hr_callback,
+    make_sample_callback,
     read_battery,
     update_battery_loop,
     update_hz_for_state,
@@ -65,20 +75,18 @@ state: dict[str, Any] = {
     "rr_intervals": [],
     "hr_history": deque(maxlen=40),
     "rr_history": deque(maxlen=50),
+    "rmssd": 0.0,
     "ppg_count": 0,
     "ppg_hz": 0.0,
-    "ppg_last_sample": "-",
+    "ppg_raw": None,
     "acc_count": 0,
     "acc_hz": 0.0,
-    "acc_last_sample": "-",
     "acc_raw": (0.0, 0.0, 0.0),
     "gyro_count": 0,
     "gyro_hz": 0.0,
-    "gyro_last_sample": "-",
     "gyro_raw": (0.0, 0.0, 0.0),
     "mag_count": 0,
     "mag_hz": 0.0,
-    "mag_last_sample": "-",
     "mag_raw": (0.0, 0.0, 0.0),
     # State fields matching Nuanic design
     "battery": "-",
@@ -86,6 +94,7 @@ state: dict[str, Any] = {
     "last_marker": "-",
     "csv_path": "-",
     "csv_rows_written": 0,
+    "csv_write_errors": 0,
 }
 
 # Statistics counters
@@ -179,59 +188,11 @@ def _format_marker_legend(hotkeys: dict) -> str:
 # calculate_rmssd, draw_sparkline, update_hz → imported from dashboard_utils
 
 
-def hr_callback(data):
-    if isinstance(data, tuple) and len(data) >= 2:
-        hr_val, rr_ints = data
-        if hr_val > 0:
-            state["hr"] = hr_val
-            state["hr_history"].append(hr_val)
-        if rr_ints:
-            state["rr_intervals"] = rr_ints
-            state["rr_history"].extend(rr_ints)
-
-
-def ppg_callback(data):
-    timestamp, samples = data
-    state["ppg_count"] += len(samples)
-    t = time.time()
-    ppg_timestamps.append((t, len(samples)))
-    state["ppg_last_sample"] = str(samples[-1])
-
-
-def acc_callback(data):
-    timestamp, samples = data
-    state["acc_count"] += len(samples)
-    t = time.time()
-    acc_timestamps.append((t, len(samples)))
-    last_val = samples[-1]
-    state["acc_raw"] = (last_val[0], last_val[1], last_val[2])
-    state["acc_last_sample"] = (
-        f"({last_val[0]:+4d}, {last_val[1]:+4d}, {last_val[2]:+4d}) mg"
-    )
-
-
-def gyro_callback(data):
-    timestamp, samples = data
-    state["gyro_count"] += len(samples)
-    t = time.time()
-    gyro_timestamps.append((t, len(samples)))
-    last_val = samples[-1]
-    state["gyro_raw"] = (last_val[0], last_val[1], last_val[2])
-    state["gyro_last_sample"] = (
-        f"({last_val[0]:+4.1f}, {last_val[1]:+4.1f}, {last_val[2]:+4.1f}) dps"
-    )
-
-
-def mag_callback(data):
-    timestamp, samples = data
-    state["mag_count"] += len(samples)
-    t = time.time()
-    mag_timestamps.append((t, len(samples)))
-    last_val = samples[-1]
-    state["mag_raw"] = (last_val[0], last_val[1], last_val[2])
-    state["mag_last_sample"] = (
-        f"({last_val[0]:+3.1f}, {last_val[1]:+3.1f}, {last_val[2]:+3.1f}) uT"
-    )
+hr_callback = make_hr_callback(state)
+ppg_callback = make_sample_callback(state, "ppg", ppg_timestamps)
+acc_callback = make_sample_callback(state, "acc", acc_timestamps)
+gyro_callback = make_sample_callback(state, "gyro", gyro_timestamps)
+mag_callback = make_sample_callback(state, "mag", mag_timestamps)
 
 
 def update_hz():
@@ -246,7 +207,7 @@ def update_hz():
 
 def build_dashboard(elapsed_time: float, marker_legend: str = "") -> Panel:
     update_hz()
-    rmssd = calculate_rmssd(state["rr_history"])
+    rmssd = state["rmssd"]
 
     # 1. Device Info Header Panel
     device_info = Text()
@@ -276,6 +237,10 @@ def build_dashboard(elapsed_time: float, marker_legend: str = "") -> Panel:
         device_info.append("\nLog: ", style="bold white")
         device_info.append(f"{Path(state['csv_path']).name} ", style="cyan")
         device_info.append(f"({state['csv_rows_written']} rows written)", style="green")
+        if state["csv_write_errors"]:
+            device_info.append(
+                f" ({state['csv_write_errors']} failed)", style="bold red"
+            )
 
     # 2. Main Metrics columns
     hr_color = "red"
@@ -349,7 +314,7 @@ def build_dashboard(elapsed_time: float, marker_legend: str = "") -> Panel:
         "Photoplethysmography (PPG)",
         ppg_status,
         f"{state['ppg_hz']:.1f} Hz",
-        state["ppg_last_sample"],
+        format_last_sample(state, "ppg"),
     )
 
     # ACC Row
@@ -358,7 +323,7 @@ def build_dashboard(elapsed_time: float, marker_legend: str = "") -> Panel:
         "Accelerometer (ACC)",
         acc_status,
         f"{state['acc_hz']:.1f} Hz",
-        state["acc_last_sample"],
+        format_last_sample(state, "acc"),
     )
 
     # Gyro Row
@@ -367,7 +332,7 @@ def build_dashboard(elapsed_time: float, marker_legend: str = "") -> Panel:
         "Gyroscope (GYRO)",
         gyro_status,
         f"{state['gyro_hz']:.1f} Hz",
-        state["gyro_last_sample"],
+        format_last_sample(state, "gyro"),
     )
 
     # Mag Row
@@ -376,7 +341,7 @@ def build_dashboard(elapsed_time: float, marker_legend: str = "") -> Panel:
         "Magnetometer (MAG)",
         mag_status,
         f"{state['mag_hz']:.1f} Hz",
-        state["mag_last_sample"],
+        format_last_sample(state, "mag"),
     )
 
     group = Group(metrics_table, side_by_side, streams_table)
@@ -389,12 +354,34 @@ def build_dashboard(elapsed_time: float, marker_legend: str = "") -> Panel:
     )
 
 
-async def _battery_loop(conn):
-    """Background battery refresh, updating the module-level ``state`` dict."""
+def _write_csv_rows(csv_logger: CsvLogger, rows: list[tuple[float, list]]) -> int:
+    """Write *rows* on the executor thread; returns how many failed to write."""
+    batch = [[format_timestamp(ts), *values] for ts, values in rows]
+    try:
+        csv_logger.write_rows(batch)
+    except (OSError, ValueError, csv.Error):
+        return len(batch)
+    return 0
+
+
+async def _csv_log_loop(
+    csv_queue: asyncio.Queue, csv_logger: CsvLogger, executor: ThreadPoolExecutor
+):
+    """Background CSV writer, draining queued rows outside the render tick.
+
+    File writes and flushes run on *executor* (a single worker, so rows keep
+    their order) and never block the event loop handling BLE notifications.
+    ``state`` is only updated here, on the loop thread that renders it.
+    """
+    loop = asyncio.get_running_loop()
     while True:
-        if conn and conn.polar_device and conn.polar_device._client:
-            state["battery"] = await read_battery(conn)
-        await asyncio.sleep(30)
+        rows = [await csv_queue.get()]
+        while not csv_queue.empty():
+            rows.append(csv_queue.get_nowait())
+        failed = await loop.run_in_executor(executor, _write_csv_rows, csv_logger, rows)
+        # Count instead of silently dropping so the header shows data loss.
+        state["csv_write_errors"] += failed
+        state["csv_rows_written"] = csv_logger.rows_written
 
 
 async def main():
@@ -456,6 +443,19 @@ async def main():
         default=None,
         help="Custom sampling rate for PPG stream (Hz)",
     )
+    parser.add_argument(
+        "--known-services",
+        action="store_true",
+        help=(
+            "Scan only for devices advertising the HR/Polar services and only "
+            "discover the HR, battery and PMD GATT services on connect"
+        ),
+    )
+    parser.add_argument(
+        "--cached-gatt",
+        action="store_true",
+        help="Let Windows reuse its cached GATT table instead of rediscovering it",
+    )
     args = parser.parse_args()
 
     # Marker configuration
@@ -470,7 +470,11 @@ async def main():
         state["status"] = "Scanning for Polar devices (Sense/H10/OH1)..."
 
     with Live(build_dashboard(0.0, marker_legend), refresh_per_second=10) as live:
-        device = await discover_polar_device(args.device, timeout=20.0)
+        device = await discover_polar_device(
+            args.device,
+            timeout=20.0,
+            service_uuids=POLAR_ADVERTISED_SERVICES if args.known_services else None,
+        )
 
         if not device:
             if args.device:
@@ -500,6 +504,10 @@ async def main():
             custom_kwargs["mag_sample_rate"] = args.mag_rate
         if args.ppg_rate is not None:
             custom_kwargs["ppg_sample_rate"] = args.ppg_rate
+        if args.known_services:
+            custom_kwargs["gatt_services"] = POLAR_GATT_SERVICES
+        if args.cached_gatt:
+            custom_kwargs["use_cached_services"] = True
 
         conn = create_polar_connector(
             device,
@@ -516,6 +524,10 @@ async def main():
         state["device_type"] = conn.__class__.__name__
 
         battery_task = None
+        csv_logger: CsvLogger | None = None
+        csv_task = None
+        csv_queue: asyncio.Queue[tuple[float, list]] = asyncio.Queue()
+        csv_executor: ThreadPoolExecutor | None = None
         try:
             await conn.start_notify()
             state["status"] = "Connected! Streaming live data."
@@ -527,7 +539,6 @@ async def main():
             csv_path = None
             if not args.no_log:
                 log_dir = PROJECT_ROOT / "data"
-                log_dir.mkdir(exist_ok=True)
 
                 if args.csv:
                     csv_path = Path(args.csv)
@@ -537,33 +548,38 @@ async def main():
 
                 state["csv_path"] = str(csv_path)
                 state["csv_rows_written"] = 0
+                state["csv_write_errors"] = 0
 
-                # Write header
-                with open(csv_path, mode="w", newline="", encoding="utf-8") as f:
-                    csv.writer(f).writerow(CSV_COLUMNS)
+                # Write header; the file stays open for the whole session
+                csv_logger = CsvLogger(csv_path, CSV_COLUMNS)
+                csv_logger.write_header()
+                csv_executor = ThreadPoolExecutor(max_workers=1)
+                csv_task = asyncio.create_task(
+                    _csv_log_loop(csv_queue, csv_logger, csv_executor)
+                )
 
             # Start background battery update loop
-            battery_task = asyncio.create_task(_battery_loop(conn))
+            battery_task = asyncio.create_task(update_battery_loop(conn, state))
 
-            start_time = time.time()
+            start_time = time.monotonic()
             last_log_time = start_time
 
             while True:
-                elapsed = time.time() - start_time
+                elapsed = time.monotonic() - start_time
 
                 # Poll keyboard input for markers
                 pressed_markers = input_reader.poll_markers()
                 active_marker = ""
                 if pressed_markers:
                     for m in pressed_markers:
-                        timestamp_str = time.strftime("%H:%M:%S")
+                        timestamp_str = format_timestamp(fmt="%H:%M:%S")
                         state["marker_log"].append(f"{timestamp_str} - {m}")
                         state["last_marker"] = m
                         active_marker = m
 
                 # Log metrics to CSV at 1 Hz
-                now = time.time()
-                if csv_path and (now - last_log_time) >= 1.0:
+                now = time.monotonic()
+                if csv_logger and (now - last_log_time) >= 1.0:
                     last_log_time = now
 
                     acc_x, acc_y, acc_z = (
@@ -582,32 +598,27 @@ async def main():
                         else (None, None, None)
                     )
 
-                    try:
-                        with open(
-                            csv_path, mode="a", newline="", encoding="utf-8"
-                        ) as f:
-                            writer = csv.writer(f)
-                            writer.writerow(
-                                [
-                                    time.strftime("%Y-%m-%d %H:%M:%S"),
-                                    state["hr"],
-                                    calculate_rmssd(state["rr_history"]),
-                                    state["battery"],
-                                    acc_x,
-                                    acc_y,
-                                    acc_z,
-                                    gyro_x,
-                                    gyro_y,
-                                    gyro_z,
-                                    mag_x,
-                                    mag_y,
-                                    mag_z,
-                                    active_marker,
-                                ]
-                            )
-                        state["csv_rows_written"] += 1
-                    except Exception:
-                        pass
+                    # Enqueue only; formatting and file I/O happen in _csv_log_loop
+                    csv_queue.put_nowait(
+                        (
+                            time.time(),
+                            [
+                                state["hr"],
+                                state["rmssd"],
+                                state["battery"],
+                                acc_x,
+                                acc_y,
+                                acc_z,
+                                gyro_x,
+                                gyro_y,
+                                gyro_z,
+                                mag_x,
+                                mag_y,
+                                mag_z,
+                                active_marker,
+                            ],
+                        )
+                    )
 
                 live.update(build_dashboard(elapsed, marker_legend))
                 await asyncio.sleep(0.1)  # Refresh dashboard at 10 Hz
@@ -623,6 +634,17 @@ async def main():
             live.update(build_dashboard(0.0, marker_legend))
             if battery_task:
                 battery_task.cancel()
+            if csv_task:
+                csv_task.cancel()
+            if csv_executor:
+                # Let an in-flight batch finish before the final write/close.
+                csv_executor.shutdown(wait=True)
+            if csv_logger:
+                pending = []
+                while not csv_queue.empty():
+                    pending.append(csv_queue.get_nowait())
+                _write_csv_rows(csv_logger, pending)
+                csv_logger.close()
             await conn.stop_notify()
             state["status"] = "Disconnected."
             live.update(build_dashboard(0.0, marker_legend))
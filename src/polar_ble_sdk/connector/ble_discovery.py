@@ -3,12 +3,19 @@ from __future__ import annotations
 """BLE discovery helpers for Polar sensors."""
 
 import asyncio
+import contextlib
 import time
-from typing import Optional
+from typing import Optional, Sequence
 
 from bleak import BleakScanner
 
 PREFERRED_POLAR_TOKENS = ("sense", "verity", "oh1", "h10")
+# Heart Rate and Polar's registered 16-bit service UUID; pass as
+# ``service_uuids`` to let the OS drop unrelated advertisements.
+POLAR_ADVERTISED_SERVICES = (
+    "0000180d-0000-1000-8000-00805f9b34fb",
+    "0000feee-0000-1000-8000-00805f9b34fb",
+)
 
 
 def _device_name(device, advertisement_data=None) -> str:
@@ -27,6 +34,10 @@ def _device_matches_target(device, name: str, target: Optional[str]) -> bool:
     return target_lower in name.lower() or target_lower == address
 
 
+def _service_filter(service_uuids: Optional[Sequence[str]]) -> Optional[list[str]]:
+    return list(service_uuids) if service_uuids else None
+
+
 def _is_polar_name(name: str) -> bool:
     return "polar" in name.lower()
 
@@ -43,20 +54,35 @@ async def discover_polar_device(
     *,
     timeout: float = 20.0,
     fallback_after: float = 6.0,
+    service_uuids: Optional[Sequence[str]] = None,
 ):
-    """Find a Polar BLE device, returning early for exact/preferred sensor matches."""
+    """Find a Polar BLE device, returning early for exact/preferred sensor matches.
+
+    ``service_uuids`` (e.g. :data:`POLAR_ADVERTISED_SERVICES`) filters
+    advertisements in the OS scanner before they reach the callback.
+    """
     fallback_device = None
     selected_device = None
     selected_event = asyncio.Event()
-    start_time = time.monotonic()
+    any_polar_event = asyncio.Event()
+    # Devices advertise several times a second; once a named device has been
+    # classified, its later advertisements can be skipped with one set lookup.
+    classified: set[str] = set()
 
     def _on_detect(device, advertisement_data):
         nonlocal fallback_device, selected_device
 
+        # The first exact/preferred match wins; later advertisements can
+        # arrive before the scanner stops and must not replace it.
+        if selected_event.is_set() or device.address in classified:
+            return
         name = _device_name(device, advertisement_data)
+        if name:
+            classified.add(device.address)
         if _device_matches_target(device, name, target):
             selected_device = device
             selected_event.set()
+            any_polar_event.set()
             return
 
         if target or not _is_polar_name(name):
@@ -64,20 +90,26 @@ async def discover_polar_device(
 
         if fallback_device is None:
             fallback_device = device
+            any_polar_event.set()
 
         if _is_preferred_polar_name(name):
             selected_device = device
             selected_event.set()
 
-    scanner = BleakScanner(_on_detect)
+    async def _wait(event: asyncio.Event, seconds: float) -> None:
+        with contextlib.suppress(asyncio.TimeoutError):
+            await asyncio.wait_for(event.wait(), timeout=max(0.0, seconds))
+
+    start_time = time.monotonic()
+    scanner = BleakScanner(_on_detect, _service_filter(service_uuids))
     await scanner.start()
     try:
-        while time.monotonic() - start_time < timeout:
-            if selected_event.is_set():
-                return selected_device
-            if fallback_device and time.monotonic() - start_time >= fallback_after:
-                return fallback_device
-            await asyncio.sleep(0.1)
+        # Wake as soon as the callback reports a match instead of polling:
+        # prefer an exact/preferred sensor until ``fallback_after``, then take
+        # the first Polar device seen (waiting for one until ``timeout``).
+        await _wait(selected_event, min(fallback_after, timeout))
+        if not selected_event.is_set():
+            await _wait(any_polar_event, timeout - (time.monotonic() - start_time))
     finally:
         await scanner.stop()
 
@@ -89,27 +121,40 @@ async def discover_dual_polar_devices(
     sense_target: Optional[str] = None,
     *,
     timeout: float = 10.0,
+    partner_timeout: Optional[float] = None,
+    service_uuids: Optional[Sequence[str]] = None,
 ) -> tuple[Optional[object], Optional[object]]:
     """Scan for both a Polar H10 and a Polar Verity Sense/OH1 simultaneously.
 
+    With ``partner_timeout``, the scan stops that many seconds after the
+    first sensor is found even if the other one has not shown up.
+    ``service_uuids`` works as in :func:`discover_polar_device`.
+
     Returns:
         tuple: (h10_device, sense_device)
     """
     found_h10 = None
     found_sense = None
+    both_found = asyncio.Event()
+    any_found = asyncio.Event()
+    h10_l = h10_target.lower() if h10_target else None
+    sense_l = sense_target.lower() if sense_target else None
+    classified: set[str] = set()
 
     def _on_detect(device, advertisement_data):
         nonlocal found_h10, found_sense
+        if device.address in classified:
+            return
         name = _device_name(device, advertisement_data)
+        if name:
+            classified.add(device.address)
         name_lower = name.lower()
+        address_lower = device.address.lower()
 
         # Match H10
         is_h10_candidate = "h10" in name_lower
-        if h10_target:
-            target_l = h10_target.lower()
-            is_h10_candidate = (
-                target_l in name_lower or target_l == device.address.lower()
-            )
+        if h10_l:
+            is_h10_candidate = h10_l in name_lower or h10_l == address_lower
 
         if is_h10_candidate and not found_h10:
             found_h10 = device
@@ -118,23 +163,34 @@ async def discover_dual_polar_devices(
         is_sense_candidate = any(
             token in name_lower for token in ("sense", "verity", "oh1")
         )
-        if sense_target:
-            target_l = sense_target.lower()
-            is_sense_candidate = (
-                target_l in name_lower or target_l == device.address.lower()
-            )
+        if sense_l:
+            is_sense_candidate = sense_l in name_lower or sense_l == address_lower
 
         if is_sense_candidate and not found_sense:
             found_sense = device
 
-    scanner = BleakScanner(_on_detect)
+        if found_h10 or found_sense:
+            any_found.set()
+        if found_h10 and found_sense:
+            both_found.set()
+
+    # One shared scan for both sensors; return as soon as the pair is complete.
+    start_time = time.monotonic()
+    scanner = BleakScanner(_on_detect, _service_filter(service_uuids))
     await scanner.start()
     try:
-        start_time = time.monotonic()
-        while time.monotonic() - start_time < timeout:
-            if found_h10 and found_sense:
-                break
-            await asyncio.sleep(0.1)
+        if partner_timeout is None:
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(both_found.wait(), timeout=timeout)
+        else:
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(any_found.wait(), timeout=timeout)
+            remaining = timeout - (time.monotonic() - start_time)
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(
+                    both_found.wait(),
+                    timeout=max(0.0, min(partner_timeout, remaining)),
+                )
     finally:
         await scanner.stop()
 
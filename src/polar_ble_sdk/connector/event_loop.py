@@ -0,0 +1,19 @@
+"""asyncio event loop setup shared by the streaming entry points."""
+
+from __future__ import annotations
+
+import asyncio
+
+
+def use_uvloop() -> bool:
+    """Install uvloop's event loop policy when it is available.
+
+    uvloop does not support Windows, where the default loop is kept.
+    Returns whether uvloop was installed.
+    """
+    try:
+        import uvloop
+    except ImportError:
+        return False
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    return True
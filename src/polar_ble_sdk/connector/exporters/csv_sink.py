@@ -4,42 +4,93 @@ from __future__ import annotations
 
 import csv
 from pathlib import Path
-from typing import Any
+from typing import Any, TextIO
 
 from ..schemas import SignalPacket
 
 
-def _flatten_packet(packet: dict[str, Any]) -> dict[str, Any]:
+def _flatten_packet(
+    timestamp: Any,
+    source: Any,
+    subject_id: Any,
+    signals: dict[str, Any],
+    features: dict[str, Any],
+) -> dict[str, Any]:
     flat: dict[str, Any] = {
-        "timestamp": packet.get("timestamp"),
-        "source": packet.get("source"),
-        "subject_id": packet.get("subject_id"),
+        "timestamp": timestamp,
+        "source": source,
+        "subject_id": subject_id,
     }
-    for key, value in (packet.get("signals") or {}).items():
+    for key, value in signals.items():
         flat[f"signals.{key}"] = value
-    for key, value in (packet.get("features") or {}).items():
+    for key, value in features.items():
         flat[f"features.{key}"] = value
     return flat
 
 
 class CsvSink:
-    """Append packets as rows in a CSV file."""
+    """Append packets as rows in a CSV file.
 
-    def __init__(self, path: Path | str) -> None:
+    The file is opened on the first packet and kept open; rows are flushed
+    every ``flush_every`` packets (default: every packet) and on :meth:`close`.
+    """
+
+    def __init__(self, path: Path | str, flush_every: int = 1) -> None:
         self._path = Path(path)
         self._path.parent.mkdir(parents=True, exist_ok=True)
+        self._flush_every = max(1, flush_every)
+        self._handle: TextIO | None = None
+        self._writer: Any = None
+        self._pending = 0
 
     def send(self, packet: SignalPacket | dict[str, Any]) -> None:
         if isinstance(packet, SignalPacket):
-            data = packet.to_dict()
+            # Flattening only reads the payload, so skip to_dict()'s copies.
+            flat = _flatten_packet(
+                packet.timestamp,
+                packet.source,
+                packet.subject_id,
+                packet.signals,
+                packet.features,
+            )
         else:
-            data = packet
+            flat = _flatten_packet(
+                packet.get("timestamp"),
+                packet.get("source"),
+                packet.get("subject_id"),
+                packet.get("signals") or {},
+                packet.get("features") or {},
+            )
+        writer = self._writer
+        if writer is None:
+            file_exists = self._path.exists()
+            self._handle = self._path.open("a", newline="", encoding="utf-8")
+            writer = self._writer = csv.writer(self._handle)
+            if not file_exists:
+                writer.writerow(flat.keys())
 
-        flat = _flatten_packet(data)
-        file_exists = self._path.exists()
+        # The flattened dict's insertion order is the column order, so rows
+        # go straight to csv.writer without DictWriter's per-field lookups.
+        writer.writerow(flat.values())
+        self._pending += 1
+        if self._pending >= self._flush_every:
+            self.flush()
 
-        with self._path.open("a", newline="", encoding="utf-8") as handle:
-            writer = csv.DictWriter(handle, fieldnames=list(flat.keys()))
-            if not file_exists:
-                writer.writeheader()
-            writer.writerow(flat)
+    def flush(self) -> None:
+        if self._handle is not None and self._pending:
+            self._handle.flush()
+            self._pending = 0
+
+    def close(self) -> None:
+        if self._handle is None:
+            return
+        self.flush()
+        self._handle.close()
+        self._handle = None
+        self._writer = None
+
+    def __enter__(self) -> CsvSink:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
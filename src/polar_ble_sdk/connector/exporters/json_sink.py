@@ -3,22 +3,52 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import Any
+from typing import Any, TextIO
 
 from ..schemas import SignalPacket
 
 
 class JsonLinesSink:
-    """Append packets as JSON lines to a file."""
+    """Append packets as JSON lines to a file.
 
-    def __init__(self, path: Path | str) -> None:
+    The file is opened on the first packet and kept open; encoded lines are
+    collected and written in one call every ``flush_every`` packets (default:
+    every packet) and on :meth:`close`.
+    """
+
+    def __init__(self, path: Path | str, flush_every: int = 1) -> None:
         self._path = Path(path)
         self._path.parent.mkdir(parents=True, exist_ok=True)
+        self._flush_every = max(1, flush_every)
+        self._handle: TextIO | None = None
+        self._pending: list[str] = []
 
     def send(self, packet: SignalPacket | dict[str, Any]) -> None:
         if isinstance(packet, SignalPacket):
             line = packet.to_json()
         else:
             line = SignalPacket(**packet).to_json()
-        with self._path.open("a", encoding="utf-8") as handle:
-            handle.write(line + "\n")
+        self._pending.append(line + "\n")
+        if len(self._pending) >= self._flush_every:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self._pending:
+            return
+        if self._handle is None:
+            self._handle = self._path.open("a", encoding="utf-8")
+        self._handle.write("".join(self._pending))
+        self._handle.flush()
+        self._pending.clear()
+
+    def close(self) -> None:
+        self.flush()
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+
+    def __enter__(self) -> JsonLinesSink:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
@@ -15,6 +15,7 @@ def iter_csv(
     column_map: dict[str, dict[str, str]],
     source: str = "dataset",
     subject_id: str | None = None,
+    chunksize: int = 65536,
 ) -> Iterator[SignalPacket]:
     """Yield standardized packets from a CSV dataset.
 
@@ -23,22 +24,48 @@ def iter_csv(
             "signals": {"hr_bpm": "HR"},
             "features": {"rmssd": "RMSSD"}
         }
+
+    The file is read ``chunksize`` rows at a time so memory stays bounded
+    regardless of recording length, and only the mapped columns are parsed.
     """
-    df = pd.read_csv(path)
-    for _, row in df.iterrows():
-        signals = {
-            key: row[value]
-            for key, value in (column_map.get("signals") or {}).items()
-            if value in row
-        }
-        features = {
-            key: row[value]
-            for key, value in (column_map.get("features") or {}).items()
-            if value in row
-        }
+    wanted = {
+        column
+        for section in ("signals", "features")
+        for column in (column_map.get(section) or {}).values()
+    }
+    # Narrow the parse only when a mapped column exists: an empty selection
+    # would make read_csv drop every row instead of yielding empty packets.
+    header = pd.read_csv(path, nrows=0).columns
+    usecols = [column for column in header if column in wanted] or None
+    for chunk in pd.read_csv(path, chunksize=chunksize, usecols=usecols):
+        yield from _iter_chunk(chunk, column_map, source, subject_id)
+
+
+def _resolve_columns(df: pd.DataFrame, mapping: dict[str, str] | None) -> list:
+    """Return ``(key, values)`` pairs for mapped columns present in ``df``.
+
+    Columns are converted once per chunk with ``tolist()`` so rows are read
+    from plain Python lists instead of boxing each row into a Series.
+    """
+    return [
+        (key, df[column].tolist())
+        for key, column in (mapping or {}).items()
+        if column in df.columns
+    ]
+
+
+def _iter_chunk(
+    df: pd.DataFrame,
+    column_map: dict[str, dict[str, str]],
+    source: str,
+    subject_id: str | None,
+) -> Iterator[SignalPacket]:
+    signal_columns = _resolve_columns(df, column_map.get("signals"))
+    feature_columns = _resolve_columns(df, column_map.get("features"))
+    for i in range(len(df)):
         yield SignalPacket(
             source=source,
             subject_id=subject_id,
-            signals=signals,
-            features=features,
+            signals={key: values[i] for key, values in signal_columns},
+            features={key: values[i] for key, values in feature_columns},
         )
@@ -7,6 +7,10 @@ import json
 from time import time
 from typing import Any
 
+# ``json.dumps`` with non-default options builds a new encoder on every call;
+# packets are serialized per sample, so share one compact encoder instead.
+_JSON_ENCODER = json.JSONEncoder(separators=(",", ":"))
+
 
 @dataclass
 class SignalPacket:
@@ -28,4 +32,13 @@ class SignalPacket:
         }
 
     def to_json(self) -> str:
-        return json.dumps(self.to_dict(), separators=(",", ":"))
+        # Encoding only reads the payload, so skip to_dict()'s defensive copies.
+        return _JSON_ENCODER.encode(
+            {
+                "timestamp": self.timestamp,
+                "source": self.source,
+                "subject_id": self.subject_id,
+                "signals": self.signals,
+                "features": self.features,
+            }
+        )
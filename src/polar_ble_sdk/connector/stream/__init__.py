@@ -1,3 +1,4 @@
+from .base import POLAR_GATT_SERVICES
 from .h10 import PolarH10
 from .verity_sense import PolarVeritySense
 from .watch import PolarWatch
@@ -17,6 +18,7 @@ def create_polar_connector(device, **kwargs):
 
 
 __all__ = [
+    "POLAR_GATT_SERVICES",
     "PolarH10",
     "PolarVeritySense",
     "PolarWatch",
@@ -2,16 +2,28 @@ from __future__ import annotations
 
 import asyncio
 import contextlib
+import functools
 import sys
 import time
 import traceback
-from typing import Any
+from typing import TYPE_CHECKING, Any
+from bleak import BleakClient, BleakScanner
 from polar_python import PolarDevice
 from polar_python.constants import (
     PmdMeasurementType,
     PolarCharacteristic,
 )
 
+if TYPE_CHECKING:
+    from bleak.args.winrt import WinRTClientArgs
+
+# Services the connectors actually use: Heart Rate, Battery and Polar PMD.
+POLAR_GATT_SERVICES = (
+    "0000180d-0000-1000-8000-00805f9b34fb",
+    "0000180f-0000-1000-8000-00805f9b34fb",
+    "fb005c80-02e7-f387-1cad-8acd2d8df0c8",
+)
+
 
 class BasePolarDevice:
     """Base class for connecting and streaming from Polar devices."""
@@ -31,6 +43,20 @@ class BasePolarDevice:
         )
         self.pair_timeout = kwargs.get("pair_timeout", 60.0)
         self.post_pair_delay = kwargs.get("post_pair_delay", 2.0)
+        # Optional lock shared between connectors so that only one of them
+        # connects (and runs GATT discovery) at a time.
+        self.connect_lock: asyncio.Lock | None = kwargs.get("connect_lock")
+        # Optional service UUIDs to restrict GATT discovery to on connect
+        # (e.g. POLAR_GATT_SERVICES); None discovers the full GATT table.
+        self.gatt_services = kwargs.get("gatt_services")
+        # Let Windows serve the GATT table from its cache instead of reading it
+        # from the device on every connect (BlueZ and macOS cache on their own).
+        self.use_cached_services: bool | None = kwargs.get("use_cached_services")
+        # PMD capability answers are fixed per device, so cache them across
+        # connection attempts and reconnects instead of re-querying over GATT.
+        self._features_cache: list | None = None
+        self._settings_cache: dict[PmdMeasurementType, dict] = {}
+        self._connection_request: Any = None
 
     def _log(self, msg: str) -> None:
         if self.verbose:
@@ -38,31 +64,41 @@ class BasePolarDevice:
 
     async def start_notify(self) -> None:
         """Connect to device and initialize notifications."""
+        await self._resolve_device()
         device_name = getattr(self.device, "name", "") or ""
         last_error: Any = None
 
         async def _subscribe_and_start():
-            await self.polar_device._client.start_notify(
-                PolarCharacteristic.PMD_CONTROL_POINT.value,
-                self.polar_device._handle_pmd_control,
-            )
-            await self.polar_device._client.start_notify(
-                PolarCharacteristic.PMD_DATA.value, self.polar_device._handle_pmd_data
-            )
+            await self._report_mtu()
+            # HR-only sessions never touch the PMD service, so skip its two
+            # CCCD writes (and the feature query in start_streams).
+            if self._needs_pmd():
+                self._request_fast_connection()
+                # The two CCCDs are independent attributes, so enable them in
+                # parallel instead of paying two sequential round trips.
+                client = self.polar_device._client
+                await asyncio.gather(
+                    client.start_notify(
+                        PolarCharacteristic.PMD_CONTROL_POINT.value,
+                        self.polar_device._handle_pmd_control,
+                    ),
+                    client.start_notify(
+                        PolarCharacteristic.PMD_DATA.value,
+                        self.polar_device._handle_pmd_data,
+                    ),
+                )
             self._running = True
             await self.start_streams()
 
         for attempt in range(1, self.connect_attempts + 1):
             attempt_started = time.monotonic()
             try:
-                self.polar_device = PolarDevice(self.device)
+                self.polar_device = self._make_polar_device()
                 self._log(
                     f"Connecting to {device_name or 'Polar device'} "
                     f"(attempt {attempt}/{self.connect_attempts})..."
                 )
-                await asyncio.wait_for(
-                    self.polar_device._client.connect(), timeout=self.connect_timeout
-                )
+                await self._connect_client(self.polar_device._client)
                 await self._reconnect_if_needed()
                 await self._pair_if_needed(device_name)
                 stream_setup_started = time.monotonic()
@@ -105,10 +141,7 @@ class BasePolarDevice:
                         )
                         await self._disconnect_client(clear_device=False)
                         await asyncio.sleep(1.0)
-                        await asyncio.wait_for(
-                            self.polar_device._client.connect(),
-                            timeout=self.connect_timeout,
-                        )
+                        await self._connect_client(self.polar_device._client)
                         self._log("Retrying stream subscription...")
                         stream_setup_started = time.monotonic()
                         await _subscribe_and_start()
@@ -167,7 +200,7 @@ class BasePolarDevice:
         reconnect_started = time.monotonic()
         await self._disconnect_client(clear_device=False)
         await asyncio.sleep(self.post_pair_delay)
-        await asyncio.wait_for(client.connect(), timeout=self.connect_timeout)
+        await self._connect_client(client)
         reconnect_elapsed = time.monotonic() - reconnect_started
         self._log(f"Reconnected after pairing ({reconnect_elapsed:.1f}s).")
 
@@ -184,10 +217,100 @@ class BasePolarDevice:
         self._log("Refreshing BLE connection before stream setup...")
         await self._disconnect_client(clear_device=False)
         await asyncio.sleep(self.post_pair_delay)
-        await asyncio.wait_for(client.connect(), timeout=self.connect_timeout)
+        await self._connect_client(client)
         reconnect_elapsed = time.monotonic() - reconnect_started
         self._log(f"BLE connection refreshed ({reconnect_elapsed:.1f}s).")
 
+    async def _resolve_device(self) -> None:
+        """Scan once for a device given as an address string.
+
+        BleakClient would otherwise run its own scan on every connect attempt;
+        the resolved BLEDevice is kept and reused across retries.
+        """
+        if not isinstance(self.device, str):
+            return
+        found = await BleakScanner.find_device_by_address(
+            self.device, timeout=self.connect_timeout
+        )
+        if found is not None:
+            self.device = found
+
+    def _make_polar_device(self) -> PolarDevice:
+        polar_device = PolarDevice(self.device)
+        if self.gatt_services or self.use_cached_services is not None:
+            winrt: WinRTClientArgs = {}
+            if self.use_cached_services is not None:
+                winrt["use_cached_services"] = self.use_cached_services
+            polar_device._client = BleakClient(
+                self.device,
+                services=list(self.gatt_services) if self.gatt_services else None,
+                winrt=winrt,
+            )
+        return polar_device
+
+    async def _connect_client(self, client) -> None:
+        async with self.connect_lock or contextlib.nullcontext():
+            await asyncio.wait_for(client.connect(), timeout=self.connect_timeout)
+
+    async def _report_mtu(self) -> None:
+        """Log the negotiated ATT MTU; small MTUs fragment PMD notifications.
+
+        The OS stacks negotiate the MTU themselves on connect. BlueZ only
+        learns it once a characteristic is acquired, so until then there is
+        nothing to report and the default would be misleading.
+        """
+        if not self.verbose:
+            return
+        client = getattr(self.polar_device, "_client", None)
+        if client is None:
+            return
+        if getattr(getattr(client, "_backend", None), "_mtu_size", 0) is None:
+            self._log("[DEBUG] ATT MTU not reported by the backend yet")
+            return
+        try:
+            mtu = client.mtu_size
+        except Exception as e:
+            self._log(f"[DEBUG] ATT MTU unavailable: {e}")
+            return
+        self._log(f"[DEBUG] ATT MTU: {mtu} bytes")
+        if mtu <= 23:
+            self._log(
+                "[DEBUG] Default 23-byte MTU in use; high-rate PMD streams will be "
+                "fragmented across many notifications."
+            )
+
+    def _request_fast_connection(self) -> None:
+        """Ask for a short connection interval so PMD notifications keep up.
+
+        Only WinRT exposes this to applications (Windows 11+); BlueZ needs
+        root to change connection parameters and macOS offers no API, so
+        other platforms keep the OS defaults.
+        """
+        if sys.platform != "win32":
+            return
+        backend = getattr(getattr(self.polar_device, "_client", None), "_backend", None)
+        requester = getattr(backend, "_requester", None)
+        if requester is None:
+            return
+        try:
+            from winrt.windows.devices.bluetooth import (
+                BluetoothLEPreferredConnectionParameters,
+            )
+
+            # The preference only lasts while the request object is alive.
+            self._connection_request = (
+                requester.request_preferred_connection_parameters(
+                    BluetoothLEPreferredConnectionParameters.throughput_optimized
+                )
+            )
+        except Exception as e:
+            self._log(f"[DEBUG] Connection parameter request unavailable: {e}")
+            return
+        self._log(
+            "[DEBUG] Throughput-optimized connection requested: "
+            f"{self._connection_request.status}"
+        )
+
     async def _pair_client(self) -> None:
         client = getattr(self.polar_device, "_client", None)
         if not client or not hasattr(client, "pair"):
@@ -201,6 +324,48 @@ class BasePolarDevice:
         """To be overridden by subclasses to start their specific streams."""
         pass
 
+    async def _start_hr_with_features(
+        self, fetch_features, handler, *, strict: bool = True
+    ) -> list:
+        """Subscribe to HR while the PMD feature query runs, returning the features.
+
+        The HR CCCD write and the PMD control-point query hit different
+        characteristics, so they do not need to wait for each other.
+        """
+
+        async def _features() -> list:
+            return await fetch_features() if self._needs_pmd() else []
+
+        async def _hr() -> None:
+            callback = getattr(self, "callback", None)
+            if not callback:
+                return
+            try:
+                # Bound once here, so the handler never re-checks the callback.
+                await self.polar_device.start_hr_stream(
+                    functools.partial(handler, callback)
+                )
+                self._log("[DEBUG] HR stream started OK")
+            except Exception as e:
+                self._log(f"[DEBUG] HR stream failed: {e}")
+                if strict:
+                    raise
+                if self.verbose:
+                    traceback.print_exc()
+
+        # Let both finish before surfacing an error so neither is left running.
+        features, hr_result = await asyncio.gather(
+            _features(), _hr(), return_exceptions=True
+        )
+        for result in (features, hr_result):
+            if isinstance(result, BaseException):
+                raise result
+        return features
+
+    def _needs_pmd(self) -> bool:
+        """Whether any PMD stream was requested; subclasses narrow this down."""
+        return True
+
     async def stop_notify(self) -> None:
         """Stop all streams and disconnect."""
         await self._disconnect_client()
@@ -219,11 +384,24 @@ class BasePolarDevice:
                 await client.disconnect()
 
         self._running = False
+        self._connection_request = None
         if clear_device:
             self.polar_device = None
 
+    async def _get_available_features(self) -> list:
+        """Return the device's PMD features, querying only until a non-empty answer."""
+        if self._features_cache is None:
+            features = await self.polar_device.get_available_features()
+            if not features:
+                return features
+            self._features_cache = features
+        return self._features_cache
+
     async def _get_default_settings(self, measurement_type: PmdMeasurementType) -> dict:
         """Query the device for available settings and extract the first supported value."""
+        cached = self._settings_cache.get(measurement_type)
+        if cached is not None:
+            return dict(cached)
         try:
             settings_obj = await self.polar_device.request_stream_settings(
                 measurement_type
@@ -232,7 +410,9 @@ class BasePolarDevice:
             for s in settings_obj.settings:
                 if s.values:
                     settings_dict[s.type] = s.values[0]
-            return settings_dict
+            if settings_dict:
+                self._settings_cache[measurement_type] = settings_dict
+            return dict(settings_dict)
         except Exception as ex:
             self._log(
                 f"Warning: Could not fetch settings for {measurement_type.name}: {ex}"
@@ -255,7 +435,7 @@ class BasePolarDevice:
             callback: The user-provided callback (None if stream not requested).
             measurement_type: PMD measurement type enum for feature check and settings fetch.
             method_name: Name of the start method on polar_device (e.g. ``"start_ecg_stream"``).
-            handler: The internal handler method bound to this instance.
+            handler: The internal handler method, called as ``handler(callback, data)``.
             features: List of available PMD features from ``get_available_features()``.
             defaults: Fallback kwargs keyed by string parameter name when not available in settings.
             label: Human-readable stream name for debug output.
@@ -287,7 +467,7 @@ class BasePolarDevice:
                 ):
                     resolved[key] = self.custom_settings[custom_key]
             method = getattr(self.polar_device, method_name)
-            await method(handler, **resolved)
+            await method(functools.partial(handler, callback), **resolved)
             self._log(f"[DEBUG] {label} stream started OK")
         except Exception:
             self._log(f"[DEBUG] {label} stream failed:")
@@ -22,16 +22,10 @@ class PolarH10(BasePolarDevice):
 
     async def start_streams(self) -> None:
         """Start the H10 specific streams (HR, ECG, ACC)."""
-        features = await self.polar_device.get_available_features()
-
-        # 1. Start standard Heart Rate stream
-        if self.callback:
-            try:
-                await self.polar_device.start_hr_stream(self._hr_handler)
-                self._log("[DEBUG] HR stream started OK")
-            except Exception as e:
-                self._log(f"[DEBUG] HR stream failed: {e}")
-                raise
+        # 1. Start standard Heart Rate stream (alongside the PMD feature query)
+        features = await self._start_hr_with_features(
+            self._get_available_features, self._hr_handler
+        )
 
         # 2. Start ECG stream
         await self._start_pmd_stream(
@@ -55,23 +49,26 @@ class PolarH10(BasePolarDevice):
             "ACC",
         )
 
-    def _hr_handler(self, hr_data) -> None:
-        if self.callback:
-            try:
-                self.callback((hr_data.heartrate, hr_data.rr_intervals))
-            except Exception:
-                pass
+    def _needs_pmd(self) -> bool:
+        return bool(self.ecg_callback or self.acc_callback)
+
+    # Each handler receives its callback bound at subscribe time (see
+    # _start_hr_with_features and _start_pmd_stream), so the per-packet path
+    # has no None check.
+    def _hr_handler(self, callback: Callable, hr_data) -> None:
+        try:
+            callback((hr_data.heartrate, hr_data.rr_intervals))
+        except Exception:
+            pass
 
-    def _ecg_handler(self, ecg_data) -> None:
-        if self.ecg_callback:
-            try:
-                self.ecg_callback((ecg_data.timestamp, ecg_data.data))
-            except Exception:
-                pass
+    def _ecg_handler(self, callback: Callable, ecg_data) -> None:
+        try:
+            callback((ecg_data.timestamp, ecg_data.data))
+        except Exception:
+            pass
 
-    def _acc_handler(self, acc_data) -> None:
-        if self.acc_callback:
-            try:
-                self.acc_callback((acc_data.timestamp, acc_data.data))
-            except Exception:
-                pass
+    def _acc_handler(self, callback: Callable, acc_data) -> None:
+        try:
+            callback((acc_data.timestamp, acc_data.data))
+        except Exception:
+            pass
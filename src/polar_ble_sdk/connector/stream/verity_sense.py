@@ -1,10 +1,15 @@
 from typing import Callable, Optional
 
+import functools
 import traceback
+from operator import attrgetter
 
 from polar_python.constants import PmdMeasurementType
 from .base import BasePolarDevice
 
+# C-level (x, y, z) tuple extraction for magnetometer samples.
+_XYZ = attrgetter("x", "y", "z")
+
 
 class PolarVeritySense(BasePolarDevice):
     """Connection wrapper for Polar Verity Sense / OH1 optical heart rate sensors."""
@@ -38,19 +43,10 @@ class PolarVeritySense(BasePolarDevice):
 
     async def start_streams(self) -> None:
         """Start the Verity Sense (and compatible) streams."""
-        features = await self._fetch_available_features()
-
-        # 1. Start standard Heart Rate stream
-        if self.callback:
-            try:
-                await self.polar_device.start_hr_stream(self._hr_handler)
-                self._log("[DEBUG] HR stream started OK")
-            except Exception as e:
-                self._log(f"[DEBUG] HR stream failed: {e}")
-                if self._strict_hr:
-                    raise
-                if self.verbose:
-                    traceback.print_exc()
+        # 1. Start standard Heart Rate stream (alongside the PMD feature query)
+        features = await self._start_hr_with_features(
+            self._fetch_available_features, self._hr_handler, strict=self._strict_hr
+        )
 
         # 2. Start ECG stream
         await self._start_pmd_stream(
@@ -89,7 +85,11 @@ class PolarVeritySense(BasePolarDevice):
         if self.ppi_callback and PmdMeasurementType.PPI in features:
             try:
                 self._ppi_active = True
-                await self.polar_device.start_ppi_stream(self._ppi_handler)
+                await self.polar_device.start_ppi_stream(
+                    functools.partial(
+                        self._ppi_handler, self.ppi_callback, self.callback
+                    )
+                )
                 self._log("[DEBUG] PPI stream started OK")
             except Exception:
                 self._ppi_active = False
@@ -119,14 +119,29 @@ class PolarVeritySense(BasePolarDevice):
             "MAG",
         )
 
+    def _needs_pmd(self) -> bool:
+        return any(
+            (
+                self.ecg_callback,
+                self.ppg_callback,
+                self.acc_callback,
+                self.ppi_callback,
+                self.gyro_callback,
+                self.mag_callback,
+            )
+        )
+
     async def _fetch_available_features(self) -> list:
         """Query PMD features, optionally catching non-auth errors."""
         if not self._catch_auth_on_features:
-            return await self.polar_device.get_available_features()
+            return await self._get_available_features()
         try:
-            features = await self.polar_device.get_available_features()
-            feature_names = [f.name for f in features] if features else []
-            self._log(f"[DEBUG] Available PMD features: {feature_names or '(none)'}")
+            features = await self._get_available_features()
+            if self.verbose:
+                feature_names = [f.name for f in features] if features else []
+                self._log(
+                    f"[DEBUG] Available PMD features: {feature_names or '(none)'}"
+                )
             return features
         except Exception as e:
             err_str = str(e)
@@ -151,71 +166,66 @@ class PolarVeritySense(BasePolarDevice):
         self._ppi_active = False
         await super().stop_notify()
 
-    def _hr_handler(self, hr_data) -> None:
-        if self.callback:
-            if hr_data.heartrate == 0:
-                return
-            try:
-                self.callback((hr_data.heartrate, hr_data.rr_intervals))
-            except Exception:
-                pass
+    # Each handler receives its callback bound at subscribe time (see
+    # _start_hr_with_features and _start_pmd_stream), so the per-packet path
+    # has no None check.
+    def _hr_handler(self, callback: Callable, hr_data) -> None:
+        if hr_data.heartrate == 0:
+            return
+        try:
+            callback((hr_data.heartrate, hr_data.rr_intervals))
+        except Exception:
+            pass
 
-    def _ecg_handler(self, ecg_data) -> None:
-        if self.ecg_callback:
-            try:
-                self.ecg_callback((ecg_data.timestamp, ecg_data.data))
-            except Exception:
-                pass
+    def _ecg_handler(self, callback: Callable, ecg_data) -> None:
+        try:
+            callback((ecg_data.timestamp, ecg_data.data))
+        except Exception:
+            pass
 
-    def _ppi_handler(self, ppi_data) -> None:
+    def _ppi_handler(
+        self, callback: Callable, hr_callback: Optional[Callable], ppi_data
+    ) -> None:
+        # Filtered once and shared by the PPI and forwarded HR callbacks.
         ppi_vals = [s.ppi for s in ppi_data.samples if not s.invalid_ppi]
-        if self.ppi_callback:
-            try:
-                if ppi_vals:
-                    self.ppi_callback((ppi_data.timestamp, ppi_vals))
-            except Exception:
-                pass
+        try:
+            if ppi_vals:
+                callback((ppi_data.timestamp, ppi_vals))
+        except Exception:
+            pass
         # Forward the computed heart rate from the PPI samples to the standard HR callback
-        if self.callback and ppi_data.samples:
+        if hr_callback and ppi_data.samples:
             try:
                 latest_sample = ppi_data.samples[-1]
-                self.callback((latest_sample.hr, ppi_vals))
+                hr_callback((latest_sample.hr, ppi_vals))
             except Exception:
                 pass
 
-    def _ppg_handler(self, ppg_data) -> None:
-        if self.ppg_callback:
-            try:
-                self.ppg_callback((ppg_data.timestamp, ppg_data.samples))
-            except Exception:
-                import traceback
-
+    def _ppg_handler(self, callback: Callable, ppg_data) -> None:
+        try:
+            callback((ppg_data.timestamp, ppg_data.samples))
+        except Exception:
+            if self.verbose:
                 traceback.print_exc()
 
-    def _acc_handler(self, acc_data) -> None:
-        if self.acc_callback:
-            try:
-                self.acc_callback((acc_data.timestamp, acc_data.data))
-            except Exception:
-                import traceback
-
+    def _acc_handler(self, callback: Callable, acc_data) -> None:
+        try:
+            callback((acc_data.timestamp, acc_data.data))
+        except Exception:
+            if self.verbose:
                 traceback.print_exc()
 
-    def _gyro_handler(self, gyro_data) -> None:
-        if self.gyro_callback:
-            try:
-                self.gyro_callback((gyro_data.timestamp, gyro_data.data))
-            except Exception:
-                import traceback
-
+    def _gyro_handler(self, callback: Callable, gyro_data) -> None:
+        try:
+            callback((gyro_data.timestamp, gyro_data.data))
+        except Exception:
+            if self.verbose:
                 traceback.print_exc()
 
-    def _mag_handler(self, mag_data) -> None:
-        if self.mag_callback:
-            try:
-                mag_vals = [(s.x, s.y, s.z) for s in mag_data.data]
-                self.mag_callback((mag_data.timestamp, mag_vals))
-            except Exception:
-                import traceback
-
+    def _mag_handler(self, callback: Callable, mag_data) -> None:
+        try:
+            mag_vals = list(map(_XYZ, mag_data.data))
+            callback((mag_data.timestamp, mag_vals))
+        except Exception:
+            if self.verbose:
                 traceback.print_exc()
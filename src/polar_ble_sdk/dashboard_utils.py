@@ -1,17 +1,21 @@
 """Shared helpers for Polar terminal dashboards.
 
 Both ``monitor_polar_terminal.py`` and ``monitor_dual_polar.py`` import
-from this module to avoid duplicating RMSSD, sparkline, Hz tracking,
-battery reading, and CSV logging logic.
+from this module to avoid duplicating RMSSD, sparkline, device callback,
+Hz tracking, battery reading, and CSV logging logic.
 """
 
 from __future__ import annotations
 
+import asyncio
 import csv
 import time
+import weakref
 from collections import deque
+from functools import lru_cache
+from itertools import islice
 from pathlib import Path
-from typing import Any
+from typing import IO, Any, Callable
 
 import numpy as np
 
@@ -21,6 +25,7 @@ BATTERY_SERVICE_UUID = "00002a19-0000-1000-8000-00805f9b34fb"
 
 # Sparkline block characters (dark → full).
 _SPARK_CHARS = " ▂▃▄▅▆▇█"
+_SPARK_LUT = np.array(list(_SPARK_CHARS))
 
 
 # ── Calculations ─────────────────────────────────────────────────────────────
@@ -30,30 +35,118 @@ def calculate_rmssd(rr_list) -> float:
     """Root-mean-square of successive RR-interval differences."""
     if len(rr_list) < 2:
         return 0.0
-    rr_array = np.array([float(rr) for rr in rr_list if rr is not None and rr > 0])
-    if len(rr_array) < 2:
+    # ``dtype=float`` maps ``None`` to NaN, which the ``> 0`` mask then drops.
+    rr_array = np.array(rr_list, dtype=float)
+    rr_array = rr_array[rr_array > 0]
+    if rr_array.size < 2:
         return 0.0
-    return float(np.sqrt(np.mean(np.diff(rr_array) ** 2)))
+    diffs = np.diff(rr_array)
+    return float(np.sqrt(np.dot(diffs, diffs) / diffs.size))
 
 
 def draw_sparkline(history, width: int = 30) -> str:
     """Render a single-line text sparkline from a deque of numeric values."""
     if not history:
         return ""
-    data = list(history)[-width:]
-    if not data:
+    start = max(0, len(history) - width)
+    data = np.fromiter(islice(history, start, None), dtype=float)
+    if not data.size:
         return ""
-    val_min = min(data)
-    val_max = max(data)
-    val_range = val_max - val_min or 1
+    val_min = data.min()
+    val_range = data.max() - val_min or 1
 
-    num_chars = len(_SPARK_CHARS)
-    spark = ""
-    for v in data:
-        idx = int((v - val_min) / val_range * (num_chars - 1))
-        idx = max(0, min(num_chars - 1, idx))
-        spark += _SPARK_CHARS[idx]
-    return spark
+    top = _SPARK_LUT.size - 1
+    idx = ((data - val_min) / val_range * top).astype(np.intp)
+    np.clip(idx, 0, top, out=idx)
+    return "".join(_SPARK_LUT[idx])
+
+
+# ── Display formatting ───────────────────────────────────────────────────────
+
+# Format spec and unit for the tri-axial streams shown in the dashboards.
+_XYZ_FORMATS = {
+    "acc": ("+4d", "mg"),
+    "gyro": ("+4.1f", "dps"),
+    "mag": ("+3.1f", "uT"),
+}
+
+
+def format_last_sample(state: dict[str, Any], prefix: str) -> str:
+    """Format the latest raw sample of a stream for display.
+
+    Callbacks only store ``state[f"{prefix}_raw"]``; the display string is
+    built here once per render instead of on every BLE notification.
+    """
+    if not state.get(f"{prefix}_count"):
+        return "-"
+    raw = state[f"{prefix}_raw"]
+    spec = _XYZ_FORMATS.get(prefix)
+    if spec is None:
+        return str(raw)
+    fmt, unit = spec
+    x, y, z = raw
+    return f"({x:{fmt}}, {y:{fmt}}, {z:{fmt}}) {unit}"
+
+
+@lru_cache(maxsize=8)
+def _format_second(sec: int, fmt: str) -> str:
+    return time.strftime(fmt, time.localtime(sec))
+
+
+def format_timestamp(ts: float | None = None, fmt: str = "%Y-%m-%d %H:%M:%S") -> str:
+    """Format a wall-clock time (default: now) at one-second resolution.
+
+    The string for a given second is built once and reused by every row or
+    marker stamped within that second.
+    """
+    return _format_second(int(time.time() if ts is None else ts), fmt)
+
+
+# ── Device callbacks ─────────────────────────────────────────────────────────
+
+
+def make_hr_callback(state: dict[str, Any]) -> Callable[[Any], None]:
+    """Build an HR/RR-interval callback that updates *state* in place."""
+    hr_history = state["hr_history"]
+    rr_history = state["rr_history"]
+
+    def _on_hr(data) -> None:
+        if isinstance(data, tuple) and len(data) >= 2:
+            hr_val, rr_ints = data
+            if hr_val > 0:
+                state["hr"] = hr_val
+                hr_history.append(hr_val)
+            if rr_ints:
+                state["rr_intervals"] = rr_ints
+                rr_history.extend(rr_ints)
+                # Recomputed only when new RR intervals arrive; readers use the cache.
+                state["rmssd"] = calculate_rmssd(rr_history)
+
+    return _on_hr
+
+
+def make_sample_callback(
+    state: dict[str, Any], prefix: str, timestamps: deque
+) -> Callable[[Any], None]:
+    """Build a PMD sample callback recording count, arrival time and last sample.
+
+    State keys are resolved once here, so each notification only touches
+    closure locals. Tri-axial streams store the last sample as ``(x, y, z)``.
+    """
+    count_key = f"{prefix}_count"
+    raw_key = f"{prefix}_raw"
+    xyz = prefix in _XYZ_FORMATS
+    monotonic = time.monotonic
+
+    def _on_samples(data) -> None:
+        samples = data[1]
+        n = len(samples)
+        state[count_key] += n
+        timestamps.append((monotonic(), n))
+        last = samples[-1]
+        state[raw_key] = (last[0], last[1], last[2]) if xyz else last
+
+    return _on_samples
 
 
 # ── Hz tracking ──────────────────────────────────────────────────────────────
@@ -67,49 +160,96 @@ def update_hz_for_state(
     """Compute observed sample rates and write them into *state*.
 
     Each *streams* entry is ``(key_prefix, timestamp_deque)`` where
-    ``timestamp_deque`` holds ``(t, sample_count)`` tuples.
+    ``timestamp_deque`` holds ``(t, sample_count)`` tuples with ``t`` taken
+    from :func:`time.monotonic`, so rates are immune to wall-clock jumps.
     The result is written to ``state[f"{key_prefix}_hz"]``.
     """
     if now is None:
-        now = time.time()
+        now = time.monotonic()
     for prefix, ts_list in streams:
-        recent = [item for item in ts_list if now - item[0] <= 1.5]
-        if not recent:
+        # Timestamps are appended in order, so walk back from the newest entry
+        # and stop at the first one outside the window (single pass, no copy).
+        total_samples = 0
+        oldest = None
+        for t, count in reversed(ts_list):
+            if now - t > 1.5:
+                break
+            total_samples += count
+            oldest = t
+        if oldest is None:
             state[f"{prefix}_hz"] = 0.0
             continue
-        total_samples = sum(item[1] for item in recent)
-        time_span = now - recent[0][0]
+        time_span = now - oldest
         state[f"{prefix}_hz"] = total_samples / time_span if time_span > 0.1 else 0.0
 
 
 # ── Battery ──────────────────────────────────────────────────────────────────
 
 
+# Battery characteristic resolved once per client, so periodic reads skip the
+# UUID lookup across the whole GATT table.
+_battery_chars: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+# The level is a single uint8, so every possible label is built up front.
+_BATTERY_LABELS = tuple(f"{level}%" for level in range(256))
+
+
 async def read_battery(conn) -> str:
     """Read battery level from a connected Polar device, returning a display string."""
     try:
-        data = await conn.polar_device._client.read_gatt_char(BATTERY_SERVICE_UUID)
-        return f"{int(data[0])}%" if data else "-"
+        client = conn.polar_device._client
+        char = _battery_chars.get(client)
+        if char is None:
+            char = client.services.get_characteristic(BATTERY_SERVICE_UUID)
+            if char is None:
+                return "-"
+            _battery_chars[client] = char
+        data = await client.read_gatt_char(char)
+        return _BATTERY_LABELS[data[0]] if data else "-"
     except Exception:
         return "-"
 
 
-async def update_battery_loop(conn, state: dict[str, Any]) -> None:
-    """Background task: refresh battery level in *state* every 30 s."""
+async def update_battery_loop(
+    conn, state: dict[str, Any], interval: float = 30.0
+) -> None:
+    """Background task: refresh battery level in *state* every *interval* s.
+
+    Callers read the level once right after connecting, so the loop waits
+    before its first read instead of repeating that GATT round-trip.
+    """
     while True:
-        state["battery"] = await read_battery(conn)
-        await __import__("asyncio").sleep(30)
+        await asyncio.sleep(interval)
+        if conn and conn.polar_device and conn.polar_device._client:
+            state["battery"] = await read_battery(conn)
 
 
 # ── CSV helpers ──────────────────────────────────────────────────────────────
 
 
 class CsvLogger:
-    """Manages a single CSV log file with header validation."""
+    """Manages a single CSV log file with header validation.
+
+    The file is opened once and kept open; rows are flushed to disk every
+    ``flush_every`` writes, once buffered rows are ``flush_interval`` seconds
+    old, and on :meth:`close`. The interval bounds how much a crash can lose
+    for slow (e.g. 1 Hz) loggers.
+    """
 
-    def __init__(self, path: Path | str | None, columns: list[str]) -> None:
+    def __init__(
+        self,
+        path: Path | str | None,
+        columns: list[str],
+        flush_every: int = 32,
+        flush_interval: float = 1.0,
+    ) -> None:
         self._path = Path(path) if path else None
         self._columns = columns
+        self._flush_every = max(1, flush_every)
+        self._flush_interval = flush_interval
+        self._fh: IO[str] | None = None
+        self._writer: Any = None
+        self._pending = 0
+        self._last_flush = time.monotonic()
         self.rows_written = 0
 
     @property
@@ -120,16 +260,65 @@ class CsvLogger:
     def path_str(self) -> str:
         return str(self._path) if self._path else "-"
 
+    def _open(self, path: Path, mode: str) -> IO[str]:
+        self.close()
+        fh = path.open(mode, newline="", encoding="utf-8")
+        self._fh = fh
+        self._writer = csv.writer(fh)
+        return fh
+
     def write_header(self) -> None:
         if not self._path:
             return
         self._path.parent.mkdir(parents=True, exist_ok=True)
-        with self._path.open("w", newline="", encoding="utf-8") as f:
-            csv.writer(f).writerow(self._columns)
+        fh = self._open(self._path, "w")
+        self._writer.writerow(self._columns)
+        fh.flush()
 
     def write_row(self, values: list[Any]) -> None:
         if not self._path:
             return
-        with self._path.open("a", newline="", encoding="utf-8") as f:
-            csv.writer(f).writerow(values)
+        if self._writer is None:
+            self._open(self._path, "a")
+        self._writer.writerow(values)
         self.rows_written += 1
+        self._pending += 1
+        self._maybe_flush()
+
+    def write_rows(self, rows: list[list[Any]]) -> None:
+        """Write several rows with one ``writerows`` call (e.g. a drained batch)."""
+        if not self._path or not rows:
+            return
+        if self._writer is None:
+            self._open(self._path, "a")
+        self._writer.writerows(rows)
+        self.rows_written += len(rows)
+        self._pending += len(rows)
+        self._maybe_flush()
+
+    def _maybe_flush(self) -> None:
+        if (
+            self._pending >= self._flush_every
+            or time.monotonic() - self._last_flush >= self._flush_interval
+        ):
+            self.flush()
+
+    def flush(self) -> None:
+        if self._fh is not None and self._pending:
+            self._fh.flush()
+            self._pending = 0
+        self._last_flush = time.monotonic()
+
+    def close(self) -> None:
+        if self._fh is None:
+            return
+        self.flush()
+        self._fh.close()
+        self._fh = None
+        self._writer = None
+
+    def __enter__(self) -> CsvLogger:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
@@ -25,25 +25,21 @@ class StressPredictor:
         self, bundle: ModelBundle, feature_order: list[str] | None = None
     ) -> None:
         self._bundle = bundle
-        self._feature_order = feature_order or ["rmssd", "hr_bpm"]
+        self._feature_order = tuple(feature_order or ["rmssd", "hr_bpm"])
 
     def predict(self, packet: SignalPacket | dict[str, Any]) -> Prediction:
+        # Read the packet's dicts directly; to_dict() would copy them per call.
         if isinstance(packet, SignalPacket):
-            payload = packet.to_dict()
+            features = packet.features
+            signals = packet.signals
         else:
-            payload = packet
+            features = packet.get("features") or {}
+            signals = packet.get("signals") or {}
 
-        features = payload.get("features") or {}
-        signals = payload.get("signals") or {}
-
-        values = []
-        for key in self._feature_order:
-            if key in features:
-                values.append(features[key])
-            elif key in signals:
-                values.append(signals[key])
-            else:
-                values.append(0.0)
+        values = [
+            features[key] if key in features else signals.get(key, 0.0)
+            for key in self._feature_order
+        ]
 
         X = np.asarray(values, dtype=float).reshape(1, -1)
         X_scaled = self._bundle.scaler.transform(X)
@@ -4,7 +4,6 @@ from __future__ import annotations
 
 import queue
 from dataclasses import dataclass
-from time import sleep
 from typing import Callable, Iterator
 
 from polar_ble_sdk.connector.schemas import SignalPacket
@@ -21,15 +20,22 @@ def iter_queue(
     stop_on_empty: bool = False,
     config: ReaderConfig | None = None,
 ) -> Iterator[SignalPacket | dict]:
-    """Yield packets from a Queue with optional idle polling."""
+    """Yield packets from a Queue with optional idle polling.
+
+    ``get(timeout=...)`` already waits ``poll_interval`` for the next packet,
+    so an empty queue simply re-arms the wait rather than sleeping on top of
+    it (which only delayed packets arriving during the sleep).
+    """
     cfg = config or ReaderConfig()
+    timeout: float | None = cfg.poll_interval
+    if not stop_on_empty and cfg.poll_interval <= 0:
+        timeout = None  # block instead of spinning on a zero timeout
     while True:
         try:
-            packet = source.get(timeout=cfg.poll_interval)
+            packet = source.get(timeout=timeout)
         except queue.Empty:
             if stop_on_empty:
                 break
-            sleep(cfg.poll_interval)
             continue
         yield packet
 
@@ -0,0 +1,211 @@
+"""Unit tests for shared terminal dashboard helpers."""
+
+import asyncio
+import time
+from collections import deque
+from types import SimpleNamespace
+
+import numpy as np
+
+from polar_ble_sdk.dashboard_utils import (
+    CsvLogger,
+    calculate_rmssd,
+    draw_sparkline,
+    format_last_sample,
+    format_timestamp,
+    make_hr_callback,
+    make_sample_callback,
+    read_battery,
+    update_battery_loop,
+    update_hz_for_state,
+)
+
+
+class TestCalculateRmssd:
+    def test_matches_reference_formula(self):
+        rr = [800, 820, 790, 810]
+        expected = np.sqrt(np.mean(np.diff(rr) ** 2))
+        assert np.isclose(calculate_rmssd(rr), expected)
+
+    def test_skips_none_and_non_positive_values(self):
+        rr = deque([800, None, 820, 0, 790, -5, 810])
+        assert np.isclose(calculate_rmssd(rr), calculate_rmssd([800, 820, 790, 810]))
+
+    def test_insufficient_data_returns_zero(self):
+        assert calculate_rmssd([]) == 0.0
+        assert calculate_rmssd([800]) == 0.0
+        assert calculate_rmssd([None, 0, 800]) == 0.0
+
+
+class TestFormatLastSample:
+    def test_no_samples_yet(self):
+        assert format_last_sample({"acc_count": 0, "acc_raw": (0, 0, 0)}, "acc") == "-"
+
+    def test_formats_xyz_streams(self):
+        state = {"acc_count": 3, "acc_raw": (12, -5, 980)}
+        assert format_last_sample(state, "acc") == "( +12,   -5, +980) mg"
+        state = {"gyro_count": 1, "gyro_raw": (1.25, -0.5, 0.0)}
+        assert format_last_sample(state, "gyro") == "(+1.2, -0.5, +0.0) dps"
+
+    def test_scalar_stream_uses_str(self):
+        assert format_last_sample({"ppg_count": 1, "ppg_raw": [1, 2, 3]}, "ppg") == (
+            "[1, 2, 3]"
+        )
+
+
+class TestFormatTimestamp:
+    def test_matches_strftime_at_second_resolution(self):
+        ts = 1_700_000_000.75
+        expected = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(ts))
+        assert format_timestamp(ts) == expected
+        assert format_timestamp(int(ts)) == expected
+        assert format_timestamp(ts, fmt="%H:%M:%S") == expected[-8:]
+
+
+class TestDeviceCallbacks:
+    def test_hr_callback_updates_history_and_rmssd(self):
+        state = {"hr": 0, "hr_history": deque(), "rr_history": deque(), "rmssd": 0.0}
+        on_hr = make_hr_callback(state)
+        on_hr((72, [800, 820]))
+        on_hr((0, [790]))
+        assert state["hr"] == 72
+        assert list(state["hr_history"]) == [72]
+        assert state["rr_intervals"] == [790]
+        assert np.isclose(state["rmssd"], calculate_rmssd([800, 820, 790]))
+
+    def test_sample_callback_tracks_count_rate_and_last_sample(self):
+        state = {"acc_count": 0, "ppg_count": 0}
+        acc_ts, ppg_ts = deque(), deque()
+        make_sample_callback(state, "acc", acc_ts)((0, [(1, 2, 3, 9), (4, 5, 6, 9)]))
+        make_sample_callback(state, "ppg", ppg_ts)((0, [[1, 2, 3, 4]]))
+        assert state["acc_count"] == 2
+        assert state["acc_raw"] == (4, 5, 6)
+        assert acc_ts[0][1] == 2
+        assert state["ppg_raw"] == [1, 2, 3, 4]
+
+
+class TestCsvLogger:
+    def test_rows_are_buffered_until_flush_threshold(self, tmp_path):
+        path = tmp_path / "logs" / "session.csv"
+        logger = CsvLogger(path, ["a", "b"], flush_every=2)
+        logger.write_header()
+        logger.write_row([1, 2])
+        assert path.read_text(encoding="utf-8").splitlines() == ["a,b"]
+        logger.write_row([3, 4])
+        assert path.read_text(encoding="utf-8").splitlines() == ["a,b", "1,2", "3,4"]
+        logger.close()
+        assert logger.rows_written == 2
+
+    def test_rows_older_than_flush_interval_are_flushed(self, tmp_path):
+        path = tmp_path / "slow.csv"
+        logger = CsvLogger(path, ["a"], flush_every=32, flush_interval=0.0)
+        logger.write_header()
+        logger.write_row([1])
+        assert path.read_text(encoding="utf-8").splitlines() == ["a", "1"]
+        logger.close()
+
+    def test_close_flushes_pending_rows(self, tmp_path):
+        path = tmp_path / "session.csv"
+        with CsvLogger(path, ["a"]) as logger:
+            logger.write_header()
+            logger.write_row([1])
+        assert path.read_text(encoding="utf-8").splitlines() == ["a", "1"]
+
+    def test_write_rows_writes_a_batch(self, tmp_path):
+        path = tmp_path / "batch.csv"
+        with CsvLogger(path, ["a", "b"], flush_every=2) as logger:
+            logger.write_header()
+            logger.write_rows([[1, 2], [3, 4]])
+            assert path.read_text(encoding="utf-8").splitlines() == [
+                "a,b",
+                "1,2",
+                "3,4",
+            ]
+        assert logger.rows_written == 2
+
+    def test_no_path_is_a_no_op(self):
+        logger = CsvLogger(None, ["a"])
+        logger.write_header()
+        logger.write_row([1])
+        logger.close()
+        assert logger.rows_written == 0
+        assert logger.path_str == "-"
+
+
+class TestUpdateHzForState:
+    def test_rate_from_recent_window(self):
+        state = {}
+        ts = deque([(0.0, 10), (9.0, 10), (9.5, 10), (10.0, 10)])
+        update_hz_for_state(state, ("acc", ts), now=10.0)
+        # (0.0, 10) falls outside the 1.5 s window.
+        assert state["acc_hz"] == 30 / 1.0
+
+    def test_stale_stream_reports_zero(self):
+        state = {}
+        update_hz_for_state(state, ("ppg", deque([(0.0, 5)])), now=10.0)
+        update_hz_for_state(state, ("gyro", deque()), now=10.0)
+        assert state["ppg_hz"] == 0.0
+        assert state["gyro_hz"] == 0.0
+
+
+class TestDrawSparkline:
+    def test_empty_history(self):
+        assert draw_sparkline(deque()) == ""
+
+    def test_maps_min_to_blank_and_max_to_full_block(self):
+        assert draw_sparkline([0, 7]) == " █"
+        assert draw_sparkline(deque(range(8))) == " ▂▃▄▅▆▇█"
+
+    def test_uses_only_last_width_values(self):
+        assert draw_sparkline(deque([100, 0, 1]), width=2) == " █"
+
+    def test_flat_history(self):
+        assert draw_sparkline([60, 60, 60]) == "   "
+
+
+class _FakeServices:
+    def __init__(self):
+        self.lookups = 0
+
+    def get_characteristic(self, uuid):
+        self.lookups += 1
+        return f"char:{uuid}"
+
+
+class _FakeClient:
+    def __init__(self, data):
+        self.services = _FakeServices()
+        self._data = data
+
+    async def read_gatt_char(self, char):
+        assert char.startswith("char:")
+        return self._data
+
+
+class TestReadBattery:
+    def _conn(self, client):
+        return SimpleNamespace(polar_device=SimpleNamespace(_client=client))
+
+    def test_resolves_characteristic_once(self):
+        client = _FakeClient(bytearray([87]))
+        conn = self._conn(client)
+        assert asyncio.run(read_battery(conn)) == "87%"
+        assert asyncio.run(read_battery(conn)) == "87%"
+        assert client.services.lookups == 1
+
+    def test_missing_client_returns_dash(self):
+        assert asyncio.run(read_battery(self._conn(None))) == "-"
+
+    def test_update_loop_waits_before_first_read(self):
+        conn = self._conn(_FakeClient(bytearray([50])))
+        state = {"battery": "90%"}
+
+        async def run():
+            task = asyncio.create_task(update_battery_loop(conn, state, interval=0.05))
+            await asyncio.sleep(0.01)
+            assert state["battery"] == "90%"
+            await asyncio.sleep(0.1)
+            task.cancel()
+
+        asyncio.run(run())
+        assert state["battery"] == "50%"
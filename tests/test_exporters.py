@@ -38,6 +38,30 @@ class TestCsvSink:
             assert "1.0" in content
             assert "signals.a" in content
 
+    def test_csv_batches_flushes_and_closes(self):
+        p = SignalPacket(timestamp=1.0, source="h10", signals={"hr": 72})
+        with tempfile.TemporaryDirectory() as td:
+            path = Path(td) / "batched.csv"
+            with CsvSink(path, flush_every=2) as sink:
+                sink.send(p)
+                sink.send(p)
+                assert len(path.read_text().strip().splitlines()) == 3
+                sink.send(p)
+            # close() flushes the pending row
+            assert len(path.read_text().strip().splitlines()) == 4
+
+    def test_csv_appends_without_second_header(self):
+        p = SignalPacket(timestamp=1.0, source="h10", signals={"hr": 72})
+        with tempfile.TemporaryDirectory() as td:
+            path = Path(td) / "append.csv"
+            with CsvSink(path) as sink:
+                sink.send(p)
+            with CsvSink(path) as sink:
+                sink.send(p)
+            lines = path.read_text().strip().splitlines()
+            assert len(lines) == 3
+            assert lines[0].startswith("timestamp")
+
 
 class TestJsonLinesSink:
     def test_json_writes_one_line_per_packet(self):
@@ -61,3 +85,16 @@ class TestJsonLinesSink:
             JsonLinesSink(path).send(payload)
             obj = json.loads(path.read_text().strip())
             assert obj["source"] == "test"
+
+    def test_json_batches_flushes_and_closes(self):
+        p = SignalPacket(source="h10", signals={"hr": 80})
+        with tempfile.TemporaryDirectory() as td:
+            path = Path(td) / "batched.jsonl"
+            with JsonLinesSink(path, flush_every=2) as sink:
+                sink.send(p)
+                assert not path.exists()
+                sink.send(p)
+                assert len(path.read_text().strip().splitlines()) == 2
+                sink.send(p)
+            # close() writes the pending line
+            assert len(path.read_text().strip().splitlines()) == 3
@@ -100,3 +100,43 @@ def test_replay_dataset_low_stress_label(tmp_path):
 
     assert len(predictions) == 2
     assert all(p.label == "Low Stress" for p in predictions)
+
+
+def test_iter_csv_reads_in_chunks(tmp_path):
+    data = pd.DataFrame({"HR": [60, 61, 62, 63, 64]})
+    csv_path = tmp_path / "chunked.csv"
+    data.to_csv(csv_path, index=False)
+
+    packets = list(
+        iter_csv(csv_path, {"signals": {"hr_bpm": "HR"}}, source="test", chunksize=2)
+    )
+
+    assert [p.signals["hr_bpm"] for p in packets] == [60, 61, 62, 63, 64]
+
+
+def test_iter_csv_yields_native_values(tmp_path):
+    data = pd.DataFrame({"HR": [70, 75], "RMSSD": [45.5, 42.2], "Other": [1, 2]})
+    csv_path = tmp_path / "native.csv"
+    data.to_csv(csv_path, index=False)
+
+    column_map = {
+        "signals": {"hr_bpm": "HR", "missing": "NotAColumn"},
+        "features": {"rmssd": "RMSSD"},
+    }
+    packets = list(iter_csv(csv_path, column_map, source="test"))
+
+    assert packets[1].signals == {"hr_bpm": 75}
+    assert packets[1].features == {"rmssd": 42.2}
+    assert type(packets[0].signals["hr_bpm"]) is int
+    packets[0].to_json()
+
+
+def test_iter_csv_keeps_rows_without_mapped_columns(tmp_path):
+    data = pd.DataFrame({"Other": [1, 2, 3]})
+    csv_path = tmp_path / "unmapped.csv"
+    data.to_csv(csv_path, index=False)
+
+    packets = list(iter_csv(csv_path, {"signals": {"hr_bpm": "HR"}}, source="test"))
+
+    assert len(packets) == 3
+    assert packets[0].signals == {}
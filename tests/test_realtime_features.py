@@ -0,0 +1,45 @@
+"""
+Tests for the window features computed by the realtime prediction script.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+realtime = pytest.importorskip("scripts.predict_realtime")
+
+
+def _pandas_skew_kurt(rows):
+    series = [pd.Series(r.astype(np.float64)) for r in rows]
+    return (
+        np.array([s.skew() for s in series]),
+        np.array([s.kurt() for s in series]),
+    )
+
+
+class TestRealtimeSkewKurt:
+    """predict_realtime._skew_kurt must agree with pandas skew/kurt"""
+
+    @pytest.mark.parametrize("value", [0.0, 0.1, 0.37, 3.3, 1e4])
+    def test_constant_rows_report_zero(self, value):
+        rows = np.full((2, 500), value)
+        centered = rows - rows.mean(axis=1, keepdims=True)
+        skew, kurt = realtime._skew_kurt(centered, rows.min(axis=1), rows.max(axis=1))
+        np.testing.assert_array_equal(skew, 0.0)
+        np.testing.assert_array_equal(kurt, 0.0)
+
+    def test_random_rows_match_pandas(self):
+        rows = np.random.default_rng(0).normal(5.0, 2.0, size=(2, 100))
+        centered = rows - rows.mean(axis=1, keepdims=True)
+        skew, kurt = realtime._skew_kurt(centered, rows.min(axis=1), rows.max(axis=1))
+        ref_skew, ref_kurt = _pandas_skew_kurt(rows)
+        np.testing.assert_allclose(skew, ref_skew, rtol=1e-9)
+        np.testing.assert_allclose(kurt, ref_kurt, rtol=1e-9)
+
+    @pytest.mark.parametrize("dtype", [np.float64, np.float32])
+    def test_extract_features_constant_window(self, dtype):
+        eda = np.full(500, 0.37, dtype=dtype)
+        hr = np.full(500, 72.3, dtype=dtype)
+        features = realtime.extract_features(eda, hr)
+        # Skew and kurtosis of EDA (6, 7) and HR (15, 16).
+        np.testing.assert_array_equal(features[[6, 7, 15, 16]], 0.0)
@@ -0,0 +1,77 @@
+"""
+Tests for the feature statistics in the TabNet training script.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+stress = pytest.importorskip("scripts.replicate_tabnet_stress")
+
+
+def _pandas_skew_kurt(windows):
+    rows = [pd.Series(w.astype(np.float64)) for w in windows]
+    return (
+        np.array([s.skew() for s in rows]),
+        np.array([s.kurt() for s in rows]),
+    )
+
+
+class TestBatchStats:
+    """_batch_stats must agree with pandas skew/kurt"""
+
+    def test_random_windows_match_pandas(self):
+        rng = np.random.default_rng(0)
+        windows = rng.normal(5.0, 2.0, size=(8, 100))
+        stats = stress._batch_stats(windows)
+        skew, kurt = _pandas_skew_kurt(windows)
+        np.testing.assert_allclose(stats[:, 6], skew, rtol=1e-9)
+        np.testing.assert_allclose(stats[:, 7], kurt, rtol=1e-9)
+
+    def test_float32_windows_match_pandas(self):
+        rng = np.random.default_rng(1)
+        windows = rng.normal(5.0, 2.0, size=(8, 100)).astype(np.float32)
+        stats = stress._batch_stats(windows)
+        skew, kurt = _pandas_skew_kurt(windows)
+        np.testing.assert_allclose(stats[:, 6], skew, rtol=1e-9)
+        np.testing.assert_allclose(stats[:, 7], kurt, rtol=1e-9)
+
+    @pytest.mark.parametrize("dtype", [np.float64, np.float32])
+    @pytest.mark.parametrize("n", [30, 500])
+    @pytest.mark.parametrize("value", [0.0, 0.1, 0.37, 3.3, 1e4])
+    def test_constant_windows_report_zero(self, value, n, dtype):
+        windows = np.full((2, n), value, dtype=dtype)
+        stats = stress._batch_stats(windows)
+        skew, kurt = _pandas_skew_kurt(windows)
+        np.testing.assert_array_equal(skew, 0.0)
+        np.testing.assert_array_equal(stats[:, 6], skew)
+        np.testing.assert_array_equal(stats[:, 7], kurt)
+
+
+class TestStandardizeFold:
+    """standardize_fold must match StandardScaler fit on the training split"""
+
+    def test_matches_standard_scaler(self):
+        from sklearn.preprocessing import StandardScaler
+
+        rng = np.random.default_rng(0)
+        n = 3000
+        groups = rng.integers(0, 15, n)
+        X = np.column_stack(
+            [
+                np.full(n, 3.3),
+                1e4 + 1e-2 * rng.standard_normal(n),
+                rng.normal(2.0, 5.0, n),
+            ]
+        )
+        train = np.flatnonzero(groups != 4)
+        val, fit = train[:200], train[200:]
+        X_val, X_fit, X_test = X[val], X[fit], X[groups == 4]
+
+        expected = StandardScaler().fit(X_fit)
+        assert expected.scale_[0] == 1.0
+        moments = stress.group_moments(X, groups)
+        scaled = [X_val.copy(), X_fit.copy(), X_test.copy()]
+        stress.standardize_fold(moments, 4, *scaled)
+        for got, raw in zip(scaled, (X_val, X_fit, X_test)):
+            np.testing.assert_allclose(got, expected.transform(raw), rtol=0, atol=1e-6)